@@ -1,16 +1,27 @@
 """Azure DevOps MCP server — exposes ADO operations as Claude Code tools."""
 
-import json
+import functools
 import os
 import sys
+from typing import TYPE_CHECKING
 
 # Add project root to path so we can import core.ado
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from mcp.server.fastmcp import FastMCP
 
-from core import ado
-from core.ado import AdoConfig
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is optional; stdlib json handles the same input
+    from json import loads as _loads
+
+if TYPE_CHECKING:
+    from core.ado import AdoConfig
+
+# core.ado (with its http.client/ssl imports) is loaded by the first
+# _get_config() call rather than at server start-up. Every tool calls
+# _get_config() before touching `ado`.
+ado = None
 
 server = FastMCP(
     "Azure DevOps",
@@ -21,8 +32,14 @@ server = FastMCP(
 )
 
 
-def _get_config() -> AdoConfig:
-    """Build AdoConfig from environment variables."""
+@functools.lru_cache(maxsize=1)
+def _get_config() -> "AdoConfig":
+    """Build AdoConfig from environment variables (cached until ado_reload_config)."""
+    global ado
+    if ado is None:
+        from core import ado as _ado
+        ado = _ado
+
     org = os.environ.get("ADO_ORGANIZATION", "")
     project = os.environ.get("ADO_PROJECT", "")
     pat = os.environ.get("ADO_PAT", "")
@@ -30,7 +47,7 @@ def _get_config() -> AdoConfig:
         raise ValueError(
             "Missing environment variables. Set ADO_ORGANIZATION, ADO_PROJECT, and ADO_PAT."
         )
-    return AdoConfig(organization=org, project=project, pat=pat)
+    return ado.AdoConfig(organization=org, project=project, pat=pat)
 
 
 # ---------------------------------------------------------------------------
@@ -42,10 +59,9 @@ def ado_test_connection() -> dict:
     """Test ADO connectivity. Returns project info on success."""
     try:
         config = _get_config()
-        import urllib.parse
         url = (
-            f"https://dev.azure.com/{config.organization}/_apis/projects/"
-            f"{urllib.parse.quote(config.project, safe='')}?api-version={ado.ADO_API_VERSION}"
+            f"{config.org_url}/_apis/projects/{config.project_path}"
+            f"?api-version={ado.ADO_API_VERSION}"
         )
         result = ado._api_request(config, url, method="GET")
         return {"ok": True, "project": result.get("name"), "id": result.get("id")}
@@ -53,6 +69,17 @@ def ado_test_connection() -> dict:
         return {"error": str(e)}
 
 
+@server.tool()
+def ado_reload_config() -> dict:
+    """Re-read ADO_ORGANIZATION, ADO_PROJECT, ADO_PAT after the environment changes."""
+    _get_config.cache_clear()
+    try:
+        config = _get_config()
+        return {"ok": True, "organization": config.organization, "project": config.project}
+    except Exception as e:
+        return {"error": str(e)}
+
+
 # ---------------------------------------------------------------------------
 # Work Items — Read
 # ---------------------------------------------------------------------------
@@ -85,6 +112,8 @@ def ado_query_work_items(wiql: str) -> dict:
         wiql: WIQL query string, e.g.
             "SELECT [System.Id] FROM WorkItems WHERE [System.WorkItemType] = 'User Story'"
     """
+    if not wiql.strip():
+        return {"count": 0, "items": []}
     try:
         config = _get_config()
         items = ado.get_work_items_by_query(config, wiql)
@@ -101,6 +130,8 @@ def ado_get_child_work_items(parent_id: int) -> dict:
     Args:
         parent_id: ID of the parent work item
     """
+    if parent_id <= 0:
+        return {"error": f"Invalid parent_id: {parent_id}"}
     try:
         config = _get_config()
         children = ado.get_child_work_items(config, parent_id)
@@ -136,7 +167,7 @@ def ado_create_work_item(
     """
     try:
         config = _get_config()
-        fields = json.loads(extra_fields) if extra_fields else {}
+        fields = _loads(extra_fields) if extra_fields else {}
         result = ado.create_work_item(
             config,
             work_item_type=work_item_type,
@@ -163,7 +194,7 @@ def ado_update_work_item_fields(work_item_id: int, fields: str) -> dict:
     """
     try:
         config = _get_config()
-        field_dict = json.loads(fields)
+        field_dict = _loads(fields)
         return ado.update_work_item(config, work_item_id, field_dict)
     except Exception as e:
         return {"error": str(e)}
@@ -185,7 +216,7 @@ def ado_update_work_item_raw(work_item_id: int, patches: str) -> dict:
     """
     try:
         config = _get_config()
-        patch_list = json.loads(patches)
+        patch_list = _loads(patches)
         return ado.update_work_item_raw(config, work_item_id, patch_list)
     except Exception as e:
         return {"error": str(e)}
@@ -5,9 +5,13 @@ The change analysis itself happens in conversation. These functions handle
 the data I/O: snapshotting, saving files, pushing to ADO, updating the changelog.
 """
 
+import io
 import json
+import os
 import shutil
+import sys
 import click
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -17,6 +21,69 @@ from core.config import (
 )
 from core import ado as ado_client
 
+if sys.platform.startswith("linux"):
+    import fcntl
+    _FICLONE = 0x40049409  # ioctl from <linux/fs.h>: copy-on-write file clone
+else:
+    fcntl = None
+    _FICLONE = None
+
+# Row templates for the CR description and Change Log summary tables
+_NEW_ROW = "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>".format
+_NEW_ROW_KEYS = ("id", "title", "fe_days", "be_days", "devops_days", "design_days")
+_NEW_ROW_DEFAULTS = ("?", "?", 0, 0, 0, 0)
+_MOD_ROW = "<tr><td>{}</td><td>{}</td><td>{}</td></tr>".format
+_MOD_ROW_KEYS = ("original_id", "original_title", "change_description")
+_MOD_ROW_DEFAULTS = ("?", "?", "")
+_SUMMARY_ROW = (
+    "<tr><td>{status}</td><td>{id}</td><td>{summary}</td><td>${cost:+,.0f}</td></tr>"
+).format
+
+_BR_TRANS = str.maketrans({"\n": "<br>\n"})  # user story line breaks → HTML
+
+# Description of the per-CR Feature under the Change Log epic
+_CR_DESC_TMPL = """
+<h3>{cr_id}: {summary}</h3>
+<p><b>Date:</b> {now}</p>
+<p><b>Classification:</b> {classification}</p>
+<p><b>Risk:</b> {risk}</p>
+
+<h4>Impact</h4>
+<table>
+<tr><td><b>Effort delta</b></td><td>{delta_days} days</td></tr>
+<tr><td><b>Cost delta</b></td><td>${delta_cost:+,.0f}</td></tr>
+<tr><td><b>Timeline</b></td><td>{timeline}</td></tr>
+</table>
+
+{new_html}
+{mod_html}
+
+<h4>Original Request</h4>
+<blockquote>{preview}</blockquote>
+
+<p><b>Recommendation:</b> {recommendation}</p>
+""".strip()
+
+# Running summary on the Change Log epic itself
+_EPIC_SUMMARY_TMPL = """
+<h3>Change Log Summary — {project}</h3>
+<p><b>Total change requests:</b> {count}</p>
+<p><b>Total cost impact:</b> ${total_cost:+,.0f}</p>
+
+<table>
+<tr><th>Status</th><th>ID</th><th>Summary</th><th>Cost Impact</th></tr>
+{rows}
+<tr><td colspan="3"><b>Total</b></td><td><b>${total_cost:+,.0f}</b></td></tr>
+</table>
+""".strip()
+
+_COPY_WORKERS = 8  # parallel file copies when snapshotting output/
+_EFFORT_FIELDS = ("fe_days", "be_days", "devops_days", "design_days")
+PREVIEW_CHARS = 500  # original request text quoted in the CR description
+
+# Change Log epic IDs resolved in this process: (org, project, project_name) → ADO ID
+_changelog_epic_ids: dict[tuple[str, str, str], int] = {}
+
 
 def create_snapshot(proj: dict, cr_id: str) -> Path:
     """Snapshot current output/ before applying changes.
@@ -32,16 +99,34 @@ def create_snapshot(proj: dict, cr_id: str) -> Path:
     snap_dir.mkdir(parents=True, exist_ok=True)
 
     output_dir = Path(proj["path"]) / "output"
-    copied = 0
-    for f in output_dir.iterdir():
-        if f.is_file():
-            shutil.copy2(f, snap_dir / f.name)
-            copied += 1
+    # DirEntry.is_file() uses the d_type from readdir — no stat() per file
+    with os.scandir(output_dir) as it:
+        files = [(entry.path, entry.name) for entry in it if entry.is_file()]
+    with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as pool:
+        list(pool.map(lambda f: _clone_file(f[0], snap_dir / f[1]), files))
+    copied = len(files)
 
     click.secho(f"  ✓ Snapshot saved: {snap_dir} ({copied} files)", fg="green")
     return snap_dir
 
 
+def _clone_file(src: str | Path, dst: Path) -> None:
+    """Copy file contents, as a reflink where the filesystem supports it.
+
+    Reflinks (btrfs, XFS) share blocks copy-on-write, so the snapshot is
+    constant-time and still unaffected by later in-place rewrites of src.
+    Metadata is not copied; snapshots are only read back.
+    """
+    if _FICLONE is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
 def save_change_source(proj: dict, text: str, cr_id: str) -> Path:
     """Save the raw change request text to changes/ directory.
 
@@ -56,7 +141,7 @@ def save_change_source(proj: dict, text: str, cr_id: str) -> Path:
     changes_dir = get_changes_dir(proj)
     changes_dir.mkdir(parents=True, exist_ok=True)
     path = changes_dir / f"{cr_id}.txt"
-    path.write_text(text, encoding="utf-8")
+    path.write_bytes(text.encode("utf-8"))
     click.echo(f"  Saved change source: {path}")
     return path
 
@@ -64,6 +149,8 @@ def save_change_source(proj: dict, text: str, cr_id: str) -> Path:
 def push_new_stories_to_ado(proj: dict, stories: list[dict]) -> list[dict]:
     """Create new user stories in ADO from change request analysis.
 
+    Stories are created concurrently; results are reported in input order.
+
     Args:
         proj: Project config dict
         stories: List of story dicts, each with:
@@ -80,58 +167,20 @@ def push_new_stories_to_ado(proj: dict, stories: list[dict]) -> list[dict]:
         return []
 
     project_name = proj["project"]
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    totals = [sum(story.get(k, 0) for k in _EFFORT_FIELDS) for story in stories]
     created = []
 
-    for story in stories:
-        title = story.get("title", "")
-        user_story_text = story.get("user_story", f"As a user,\nI want to {title.lower()},\nSo that I can accomplish this goal.")
-        ac_list = story.get("acceptance_criteria", [])
-
-        fe = story.get("fe_days", 0)
-        be = story.get("be_days", 0)
-        dv = story.get("devops_days", 0)
-        ds = story.get("design_days", 0)
-        total = fe + be + dv + ds
-
-        cr_id = story.get("cr_id", "CR")
-        epic = story.get("epic", "")
-        feature = story.get("feature", "")
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-
-        # Three-line format, no italic
-        html_text = user_story_text.replace("\n", "<br>\n")
-        desc = f"<p>{html_text}</p>"
-
-        changelog = (
-            f"<br><b>Change Log:</b><br><br>"
-            f"<b>Change 1:</b> Story created<br>"
-            f"<b>Date:</b> {today}<br>"
-            f"<b>Reason:</b> {cr_id}"
-        )
-        ac_parts = []
-        if ac_list:
-            for i, ac in enumerate(ac_list, 1):
-                if isinstance(ac, dict):
-                    title = ac.get("title", f"Criterion {i}")
-                    items_html = "".join(
-                        f"<li>{item}</li>" for item in ac.get("items", [])
-                    )
-                    ac_parts.append(f"<b>AC {i}:</b> {title}<br><ul>{items_html}</ul>")
-                else:
-                    ac_parts.append(f"<b>AC {i}:</b> {ac}<br><ul><li>{ac}</li></ul>")
-        ac_html = "".join(ac_parts) + changelog
+    with ThreadPoolExecutor(max_workers=ado_client.MAX_WORKERS) as pool:
+        futures = [
+            pool.submit(_create_new_story, config, project_name, story, today, total)
+            for story, total in zip(stories, totals)
+        ]
 
+    for story, future in zip(stories, futures):
+        title = story.get("title", "")
         try:
-            result = ado_client.create_work_item(
-                config, "User Story", title,
-                description=desc,
-                tags=f"xproject;change-request;{cr_id};{project_name}",
-                extra_fields={
-                    "Microsoft.VSTS.Scheduling.Effort": total,
-                    "Microsoft.VSTS.Common.AcceptanceCriteria": ac_html,
-                },
-            )
-            ado_id = result.get("id")
+            ado_id = future.result().get("id")
             click.secho(f"  ✓ Created ADO #{ado_id}: {title}", fg="green")
             story["ado_id"] = ado_id
             created.append(story)
@@ -141,13 +190,57 @@ def push_new_stories_to_ado(proj: dict, stories: list[dict]) -> list[dict]:
     return created
 
 
+def _create_new_story(config, project_name: str, story: dict,
+                      today: str, total: int | float) -> dict:
+    """Build the description/AC HTML for one new story and create it in ADO."""
+    title = story.get("title", "")
+    user_story_text = story.get("user_story", f"As a user,\nI want to {title.lower()},\nSo that I can accomplish this goal.")
+    ac_list = story.get("acceptance_criteria", [])
+    cr_id = story.get("cr_id", "CR")
+
+    # Three-line format, no italic
+    html_text = user_story_text.translate(_BR_TRANS)
+    desc = f"<p>{html_text}</p>"
+
+    changelog = (
+        f"<br><b>Change Log:</b><br><br>"
+        f"<b>Change 1:</b> Story created<br>"
+        f"<b>Date:</b> {today}<br>"
+        f"<b>Reason:</b> {cr_id}"
+    )
+    ac_parts = []
+    if ac_list:
+        for i, ac in enumerate(ac_list, 1):
+            if isinstance(ac, dict):
+                ac_title = ac.get("title", f"Criterion {i}")
+                items_html = "".join([f"<li>{item}</li>" for item in ac.get("items", [])])
+                ac_parts.append(f"<b>AC {i}:</b> {ac_title}<br><ul>{items_html}</ul>")
+            else:
+                ac_parts.append(f"<b>AC {i}:</b> {ac}<br><ul><li>{ac}</li></ul>")
+    ac_parts.append(changelog)
+    ac_html = "".join(ac_parts)
+
+    return ado_client.create_work_item(
+        config, "User Story", title,
+        description=desc,
+        tags=f"xproject;change-request;{cr_id};{project_name}",
+        extra_fields={
+            "Microsoft.VSTS.Scheduling.Effort": total,
+            "Microsoft.VSTS.Common.AcceptanceCriteria": ac_html,
+        },
+    )
+
+
 def push_modified_stories_to_ado(proj: dict, modifications: list[dict]) -> None:
     """Update existing ADO stories based on change request analysis.
 
+    Updates are sent in one $batch request; results are reported in input order.
+
     Args:
         proj: Project config dict
         modifications: List of dicts, each with:
-            ado_id (int), fields (dict of field_path → value)
+            ado_id (int), fields (dict of field_path → value).
+            Entries for the same ado_id are merged into one update.
     """
     try:
         config = ado_client.from_project(proj)
@@ -155,19 +248,33 @@ def push_modified_stories_to_ado(proj: dict, modifications: list[dict]) -> None:
         click.secho(f"  ✗ ADO not configured: {e}", fg="red")
         return
 
+    # Merge field changes per work item so each item gets a single PATCH
+    grouped: dict[int, dict] = {}
+    titles: dict[int, str] = {}
     for mod in modifications:
         ado_id = mod.get("ado_id")
-        fields = mod.get("fields", {})
-        title = mod.get("title", f"#{ado_id}")
-
+        fields = mod.get("fields")
         if not ado_id or not fields:
             continue
+        grouped.setdefault(ado_id, {}).update(fields)
+        titles.setdefault(ado_id, mod.get("title", f"#{ado_id}"))
 
-        try:
-            ado_client.update_work_item(config, ado_id, fields)
+    if not grouped:
+        return
+
+    # All updates in one $batch call; each item still succeeds or fails alone
+    items = [{"id": ado_id, "fields": fields} for ado_id, fields in grouped.items()]
+    try:
+        results = ado_client.update_work_items_batch(config, items)
+    except Exception as e:
+        results = [{"error": str(e)}] * len(items)
+
+    for ado_id, result in zip(grouped, results):
+        title = titles[ado_id]
+        if "error" in result:
+            click.secho(f"  ✗ Failed to update #{ado_id}: {result['error']}", fg="red")
+        else:
             click.secho(f"  ✓ Updated ADO #{ado_id}: {title}", fg="green")
-        except Exception as e:
-            click.secho(f"  ✗ Failed to update #{ado_id}: {e}", fg="red")
 
 
 def update_ado_changelog(proj: dict, analysis: dict, change_text: str, cr_id: str) -> None:
@@ -187,12 +294,14 @@ def update_ado_changelog(proj: dict, analysis: dict, change_text: str, cr_id: st
         return
 
     project_name = proj.get("project", "")
+    preview = _change_preview(change_text)
     impact = analysis.get("impact", {})
     new_stories = analysis.get("new_stories", [])
     mod_stories = analysis.get("modified_stories", [])
 
     # Find or create the Change Log epic
-    changelog_epic_id = proj.get("_changelog_epic_id")
+    epic_key = (config.organization, config.project, project_name)
+    changelog_epic_id = _changelog_epic_ids.get(epic_key) or proj.get("_changelog_epic_id")
     if not changelog_epic_id:
         try:
             items = ado_client.get_work_items_by_query(
@@ -224,8 +333,10 @@ def update_ado_changelog(proj: dict, analysis: dict, change_text: str, cr_id: st
             click.secho(f"  ⚠ Failed to create Change Log epic: {e}", fg="yellow")
             return
 
-    proj["_changelog_epic_id"] = changelog_epic_id
-    save_project(proj)
+    _changelog_epic_ids[epic_key] = changelog_epic_id
+    if proj.get("_changelog_epic_id") != changelog_epic_id:
+        proj["_changelog_epic_id"] = changelog_epic_id
+        save_project(proj)
 
     # Build CR description HTML
     delta_days = impact.get("total_delta_days", 0)
@@ -233,12 +344,10 @@ def update_ado_changelog(proj: dict, analysis: dict, change_text: str, cr_id: st
 
     new_html = ""
     if new_stories:
-        rows = "".join(
-            f"<tr><td>{s.get('id','?')}</td><td>{s.get('title','?')}</td>"
-            f"<td>{s.get('fe_days',0)}</td><td>{s.get('be_days',0)}</td>"
-            f"<td>{s.get('devops_days',0)}</td><td>{s.get('design_days',0)}</td></tr>"
+        rows = "".join([
+            _NEW_ROW(*map(s.get, _NEW_ROW_KEYS, _NEW_ROW_DEFAULTS))
             for s in new_stories
-        )
+        ])
         new_html = (
             "<h4>New Stories</h4>"
             "<table><tr><th>ID</th><th>Title</th><th>FE</th><th>BE</th>"
@@ -247,44 +356,36 @@ def update_ado_changelog(proj: dict, analysis: dict, change_text: str, cr_id: st
 
     mod_html = ""
     if mod_stories:
-        rows = "".join(
-            f"<tr><td>{s.get('original_id','?')}</td>"
-            f"<td>{s.get('original_title','?')}</td>"
-            f"<td>{s.get('change_description','')}</td></tr>"
+        rows = "".join([
+            _MOD_ROW(*map(s.get, _MOD_ROW_KEYS, _MOD_ROW_DEFAULTS))
             for s in mod_stories
-        )
+        ])
         mod_html = (
             "<h4>Modified Stories</h4>"
             f"<table><tr><th>ID</th><th>Title</th><th>Change</th></tr>{rows}</table>"
         )
 
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
-    cr_description = f"""
-<h3>{cr_id}: {analysis.get('summary', 'Change request')}</h3>
-<p><b>Date:</b> {now}</p>
-<p><b>Classification:</b> {analysis.get('classification', 'unknown')}</p>
-<p><b>Risk:</b> {impact.get('risk_assessment', 'Unknown')}</p>
-
-<h4>Impact</h4>
-<table>
-<tr><td><b>Effort delta</b></td><td>{delta_days} days</td></tr>
-<tr><td><b>Cost delta</b></td><td>${delta_cost:+,.0f}</td></tr>
-<tr><td><b>Timeline</b></td><td>{impact.get('timeline_impact', 'Unknown')}</td></tr>
-</table>
-
-{new_html}
-{mod_html}
-
-<h4>Original Request</h4>
-<blockquote>{change_text[:500]}{'...' if len(change_text) > 500 else ''}</blockquote>
-
-<p><b>Recommendation:</b> {analysis.get('recommendation', '')}</p>
-""".strip()
+    summary = analysis.get("summary", "Change request")
+    cr_description = _CR_DESC_TMPL.format(
+        cr_id=cr_id,
+        summary=summary,
+        now=now,
+        classification=analysis.get("classification", "unknown"),
+        risk=impact.get("risk_assessment", "Unknown"),
+        delta_days=delta_days,
+        delta_cost=delta_cost,
+        timeline=impact.get("timeline_impact", "Unknown"),
+        new_html=new_html,
+        mod_html=mod_html,
+        preview=preview,
+        recommendation=analysis.get("recommendation", ""),
+    )
 
     try:
         result = ado_client.create_work_item(
             config, "Feature",
-            f"{cr_id}: {analysis.get('summary', 'Change request')}",
+            f"{cr_id}: {summary}",
             description=cr_description,
             tags=f"change-request;{cr_id};{project_name}",
             parent_id=changelog_epic_id,
@@ -301,13 +402,21 @@ def update_ado_changelog(proj: dict, analysis: dict, change_text: str, cr_id: st
     click.secho("  ✓ Changelog updated", fg="green")
 
 
+def _change_preview(change_text: str) -> str:
+    """First PREVIEW_CHARS characters of the request, with an ellipsis if cut."""
+    if len(change_text) <= PREVIEW_CHARS:
+        return change_text
+    return change_text[:PREVIEW_CHARS] + "..."
+
+
 def summarize_breakdown(breakdown: dict) -> str:
     """Create compact text summary of a breakdown for change analysis."""
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
     for epic in breakdown.get("epics", []):
-        lines.append(f"\nEPIC: {epic.get('name', '?')}")
+        w(f"\n\nEPIC: {epic.get('name', '?')}")
         for feature in epic.get("features", []):
-            lines.append(f"  FEATURE: {feature.get('name', '?')}")
+            w(f"\n  FEATURE: {feature.get('name', '?')}")
             for story in feature.get("stories", []):
                 sid = story.get("id", "?")
                 title = story.get("title", "?")
@@ -317,8 +426,9 @@ def summarize_breakdown(breakdown: dict) -> str:
                 if isinstance(ac, list):
                     ac = "; ".join(ac)
                 ac = ac[:80]
-                lines.append(f"    {sid}: {title} (FE:{fe}d BE:{be}d) — {ac}")
-    return "\n".join(lines)
+                w(f"\n    {sid}: {title} (FE:{fe}d BE:{be}d) — {ac}")
+    # Every line was written with a leading newline; drop the first one
+    return buf.getvalue()[1:]
 
 
 def _update_changelog_epic_summary(config, epic_id: int, proj: dict, latest: dict) -> None:
@@ -331,29 +441,24 @@ def _update_changelog_epic_summary(config, epic_id: int, proj: dict, latest: dic
         "approved": True,
     }]
 
-    rows = ""
+    row_parts = []
     total_cost = 0
     for cr in all_changes:
-        cost = cr.get("cost_delta", 0)
+        get = cr.get
+        cost = get("cost_delta", 0)
         total_cost += cost
-        status = "Approved" if cr.get("approved") else "Pending"
-        rows += (
-            f"<tr><td>{status}</td><td>{cr.get('id', '?')}</td>"
-            f"<td>{cr.get('summary', '')[:60]}</td>"
-            f"<td>${cost:+,.0f}</td></tr>"
-        )
-
-    summary_html = f"""
-<h3>Change Log Summary — {proj.get('project', '')}</h3>
-<p><b>Total change requests:</b> {len(all_changes)}</p>
-<p><b>Total cost impact:</b> ${total_cost:+,.0f}</p>
-
-<table>
-<tr><th>Status</th><th>ID</th><th>Summary</th><th>Cost Impact</th></tr>
-{rows}
-<tr><td colspan="3"><b>Total</b></td><td><b>${total_cost:+,.0f}</b></td></tr>
-</table>
-""".strip()
+        row_parts.append(_SUMMARY_ROW(
+            status="Approved" if get("approved") else "Pending",
+            id=get("id", "?"), summary=get("summary", "")[:60], cost=cost,
+        ))
+    rows = "".join(row_parts)
+
+    summary_html = _EPIC_SUMMARY_TMPL.format(
+        project=proj.get("project", ""),
+        count=len(all_changes),
+        total_cost=total_cost,
+        rows=rows,
+    )
 
     try:
         ado_client.update_work_item(
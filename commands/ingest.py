@@ -1,7 +1,9 @@
 """Ingest command: parse all requirements from input/ and prepare context."""
 
-import json
+import functools
+import os
 import click
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from core.config import (
@@ -9,20 +11,31 @@ from core.config import (
 )
 from core.context import compute_input_hash, invalidate_downstream
 from core.events import append_event
+from core.jsonio import JSONDecodeError, read_json, write_json
 from core.parser import (
-    parse_directory, estimate_tokens, compute_file_hash, parsed_filename,
+    parse_directory, estimate_tokens_from_len, compute_file_hash, parsed_filename,
     ParsedFile,
 )
 from core.usage import log_operation
 
+# Parsed-file writes are independent and release the GIL, so fan them out
+_WRITE_WORKERS = 32
+# hashlib releases the GIL on large buffers, so hashing scales with cores
+_HASH_WORKERS = os.cpu_count() or 4
 
-def run(proj: dict) -> None:
+# Per-file report lines
+_PARSED_ROW = "    ✓ {:40s} ({}, {})".format
+_SKIPPED_ROW = "    ⚠ {:40s} ({})".format
+
+
+def run(proj: dict, force: bool = False) -> None:
     """
     Parse all files in input/ directory and produce:
       - output/parsed/<filename>.md  (one per source file)
       - output/requirements_manifest.json (metadata about parsed files)
 
     Only new/changed files are written. Removed files are cleaned up.
+    If nothing changed since the last ingest, parsing is skipped unless force is set.
     """
     input_dir = get_input_dir(proj)
     changes_dir = get_changes_dir(proj)
@@ -32,14 +45,19 @@ def run(proj: dict) -> None:
     click.echo(f"  Source: {input_dir}\n")
 
     # Check for files
-    if not input_dir.exists() or not any(input_dir.rglob("*")):
+    if not _has_any(input_dir):
         click.secho("  ✗ No files found in input/ directory", fg="red")
         click.echo(f"    Drop requirement files into: {input_dir}")
         return
 
+    if not force and _inputs_unchanged(proj):
+        click.secho("  ✓ Inputs unchanged since last ingest — nothing to do", fg="green")
+        click.echo("    Use --force to re-parse anyway.")
+        return
+
     # Parse all files from input/ and changes/
     parsed = parse_directory(input_dir)
-    if changes_dir.exists() and any(changes_dir.rglob("*")):
+    if _has_any(changes_dir):
         changes_parsed = parse_directory(changes_dir)
         if changes_parsed:
             click.echo(f"  Also parsing {len(changes_parsed)} file(s) from changes/")
@@ -50,36 +68,38 @@ def run(proj: dict) -> None:
         return
 
     # Report results
-    success = [p for p in parsed if not p.error]
-    errors = [p for p in parsed if p.error]
-    images = [p for p in success if p.is_image]
-    text_files = [p for p in success if not p.is_image]
+    success, errors, images, text_files = [], [], [], []
+    for p in parsed:
+        if p.error:
+            errors.append(p)
+            continue
+        success.append(p)
+        (images if p.is_image else text_files).append(p)
 
     click.secho(f"  Parsed {len(success)} files:", fg="green")
-    for pf in success:
-        size = _content_size(pf)
-        click.echo(f"    ✓ {pf.filename:40s} ({pf.format}, {size})")
+    if success:
+        row, size_of = _PARSED_ROW, _content_size
+        click.echo("\n".join([row(pf.filename, pf.format, size_of(pf)) for pf in success]))
 
     if errors:
         click.secho(f"\n  Skipped {len(errors)} files:", fg="yellow")
-        for pf in errors:
-            click.echo(f"    ⚠ {pf.filename:40s} ({pf.error})")
+        row = _SKIPPED_ROW
+        click.echo("\n".join([row(pf.filename, pf.error) for pf in errors]))
 
     # Detect per-file changes against previous manifest
     prev_hashes = _load_previous_hashes(proj)
-    file_changes = _detect_changes(parsed, prev_hashes)
-    new_files = [f for f, status in file_changes.items() if status == "new"]
-    changed_files = [f for f, status in file_changes.items() if status == "changed"]
-    removed_files = [f for f in prev_hashes if f not in file_changes]
+    stats = _source_stats(text_files)
+    hashes = _hash_files(text_files, prev_hashes, stats)
+    new_files, changed_files, unchanged = _detect_changes(text_files, prev_hashes, hashes)
+    to_write = {*new_files, *changed_files}
+    removed_files = sorted(prev_hashes.keys() - hashes.keys())
 
     if prev_hashes and (new_files or changed_files or removed_files):
         click.secho(f"\n  Changes since last ingest:", fg="cyan")
-        for f in new_files:
-            click.echo(f"    + {f} (new)")
-        for f in changed_files:
-            click.echo(f"    ~ {f} (changed)")
-        for f in removed_files:
-            click.echo(f"    - {f} (removed)")
+        lines = [f"    + {f} (new)" for f in new_files]
+        lines += [f"    ~ {f} (changed)" for f in changed_files]
+        lines += [f"    - {f} (removed)" for f in removed_files]
+        click.echo("\n".join(lines))
 
     # Ensure parsed directory exists
     parsed_dir = get_output_path(proj, "parsed")
@@ -87,7 +107,7 @@ def run(proj: dict) -> None:
 
     # Write parsed .md files — only for new/changed files
     total_chars = 0
-    written = 0
+    pending = []
     for pf in parsed:
         if pf.error or pf.is_image or not pf.text.strip():
             continue
@@ -96,16 +116,17 @@ def run(proj: dict) -> None:
         content = f"# {pf.filename} ({pf.format})\n\n{pf.text.strip()}"
         total_chars += len(content)
 
-        change = file_changes.get(pf.filename, "new")
-        if change in ("new", "changed"):
-            out_path.write_text(content, encoding="utf-8")
-            written += 1
+        if pf.filename in to_write:
+            pending.append((out_path, content.encode("utf-8")))
+
+    written = len(pending)
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(_WRITE_WORKERS, written)) as pool:
+            list(pool.map(_write_parsed, pending))
 
     # Remove parsed files for deleted source files
     for fname in removed_files:
-        old_path = parsed_dir / parsed_filename(fname)
-        if old_path.exists():
-            old_path.unlink()
+        (parsed_dir / parsed_filename(fname)).unlink(missing_ok=True)
 
     if written:
         click.secho(f"    Wrote {written} parsed file(s) to output/parsed/", fg="cyan")
@@ -122,15 +143,24 @@ def run(proj: dict) -> None:
                 "size_bytes": pf.metadata.get("size_bytes", 0),
                 "path": str(input_dir / pf.filename),
             })
-        with open(images_path, "w", encoding="utf-8") as f:
-            json.dump(img_refs, f, indent=2)
+        write_json(images_path, img_refs)
         click.secho(f"\n  📷 {len(images)} image(s) detected — will be sent to Claude vision", fg="cyan")
 
     # Save manifest
-    est_tokens = estimate_tokens("x" * total_chars)  # approximate
+    est_tokens = estimate_tokens_from_len(total_chars)
+    changed_set = set(changed_files)
+
+    def _change_status(filename: str) -> str:
+        if filename in unchanged:
+            return "unchanged"
+        return "changed" if filename in changed_set else "new"
+
     manifest = {
         "project": project_name,
-        "files": [_file_manifest(pf, file_changes.get(pf.filename, "new")) for pf in parsed],
+        "files": [
+            _file_manifest(pf, _change_status(pf.filename), hashes, stats)
+            for pf in parsed
+        ],
         "summary": {
             "total_files": len(parsed),
             "successful": len(success),
@@ -146,8 +176,7 @@ def run(proj: dict) -> None:
     }
 
     manifest_path = get_output_path(proj, "requirements_manifest.json")
-    with open(manifest_path, "w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=2)
+    write_json(manifest_path, manifest)
 
     # Compute hash and update state
     req_hash = compute_input_hash(proj)
@@ -186,6 +215,92 @@ def run(proj: dict) -> None:
     click.echo(f"\n    Next step: xproject discover {project_name}")
 
 
+def _source_stats(files: list[ParsedFile]) -> dict[str, tuple[int, int]]:
+    """(size, mtime_ns) of each file's source, keyed by filename."""
+    return {
+        pf.filename: (pf.source_stat.st_size, pf.source_stat.st_mtime_ns)
+        for pf in files if pf.source_stat is not None
+    }
+
+
+def _hash_files(files: list[ParsedFile], prev_hashes: dict[str, tuple],
+                stats: dict[str, tuple[int, int]]) -> dict[str, str]:
+    """Content hash per filename.
+
+    Files whose source size and mtime match the previous manifest reuse the
+    recorded hash; the rest are hashed across a thread pool.
+    """
+    hashes = {}
+    to_hash = []
+    for pf in files:
+        prev = prev_hashes.get(pf.filename)
+        st = stats.get(pf.filename)
+        if prev and st and prev[1:] == st:
+            hashes[pf.filename] = prev[0]
+        else:
+            to_hash.append(pf)
+
+    if len(to_hash) < 2:
+        hashes.update((pf.filename, compute_file_hash(pf.text)) for pf in to_hash)
+    else:
+        with ThreadPoolExecutor(max_workers=min(_HASH_WORKERS, len(to_hash))) as pool:
+            digests = pool.map(lambda pf: compute_file_hash(pf.text), to_hash)
+            hashes.update(zip((pf.filename for pf in to_hash), digests))
+    return hashes
+
+
+def _inputs_unchanged(proj: dict) -> bool:
+    """True if input/ matches the stored hash and changes/ has nothing newer than the manifest."""
+    state = proj.get("state", {})
+    stored_hash = state.get("requirements_hash")
+    if not state.get("requirements_ingested") or not stored_hash:
+        return False
+    try:
+        manifest_mtime = get_output_path(proj, "requirements_manifest.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    if not get_output_path(proj, "parsed").is_dir():
+        return False
+    if compute_input_hash(proj) != stored_hash:
+        return False
+    return not _modified_since(get_changes_dir(proj), manifest_mtime)
+
+
+def _modified_since(path: Path, mtime_ns: int) -> bool:
+    """True if path or anything under it was modified after mtime_ns.
+
+    Directory mtimes are included so added and deleted entries count too.
+    """
+    try:
+        if os.stat(path).st_mtime_ns > mtime_ns:
+            return True
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if _modified_since(Path(entry.path), mtime_ns):
+                        return True
+                elif entry.stat().st_mtime_ns > mtime_ns:
+                    return True
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    return False
+
+
+def _has_any(path: Path) -> bool:
+    """True if path is a directory with at least one entry (stops at the first)."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def _write_parsed(item: tuple[Path, bytes]) -> None:
+    """Write one pre-encoded parsed file."""
+    path, data = item
+    path.write_bytes(data)
+
+
 def _content_size(pf: ParsedFile) -> str:
     """Human-readable content size."""
     if pf.is_image:
@@ -204,8 +319,10 @@ def _human_size(n: int) -> str:
         return f"{n/(1024*1024):.1f} MB"
 
 
-def _file_manifest(pf: ParsedFile, change_status: str = "new") -> dict:
-    """Create manifest entry for a parsed file."""
+def _file_manifest(pf: ParsedFile, change_status: str = "new",
+                   hashes: dict[str, str] | None = None,
+                   stats: dict[str, tuple[int, int]] | None = None) -> dict:
+    """Create manifest entry for a parsed file, reusing precomputed hashes if given."""
     entry = {
         "filename": pf.filename,
         "format": pf.format,
@@ -219,42 +336,57 @@ def _file_manifest(pf: ParsedFile, change_status: str = "new") -> dict:
         entry["media_type"] = pf.image_media_type
     else:
         entry["type"] = "text"
-        entry["text_length"] = len(pf.text)
-        entry["estimated_tokens"] = estimate_tokens(pf.text)
-        entry["content_hash"] = compute_file_hash(pf.text)
+        entry["text_length"] = text_length = len(pf.text)
+        entry["estimated_tokens"] = estimate_tokens_from_len(text_length)
+        entry["content_hash"] = (
+            hashes[pf.filename] if hashes and pf.filename in hashes
+            else compute_file_hash(pf.text)
+        )
         entry["parsed_file"] = parsed_filename(pf.filename)
-    entry.update({k: v for k, v in pf.metadata.items()})
+        if stats and pf.filename in stats:
+            entry["size"], entry["mtime_ns"] = stats[pf.filename]
+    entry.update(pf.metadata)
     return entry
 
 
-def _load_previous_hashes(proj: dict) -> dict[str, str]:
-    """Load per-file content hashes from previous manifest (if exists)."""
+def _load_previous_hashes(proj: dict) -> dict[str, tuple[str, int | None, int | None]]:
+    """Load per-file (content_hash, size, mtime_ns) from previous manifest (if exists).
+
+    The result is cached per manifest path and mtime; treat it as read-only.
+    """
     manifest_path = get_output_path(proj, "requirements_manifest.json")
-    if not manifest_path.exists():
+    try:
+        mtime_ns = manifest_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
+    return _load_hashes_cached(str(manifest_path), mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_hashes_cached(manifest_path: str,
+                        mtime_ns: int) -> dict[str, tuple[str, int | None, int | None]]:
+    """Parse per-file hashes and stats from a manifest. mtime_ns is only part of the cache key."""
     try:
-        with open(manifest_path, "r") as f:
-            prev = json.load(f)
+        prev = read_json(Path(manifest_path))
         return {
-            entry["filename"]: entry["content_hash"]
+            entry["filename"]: (entry["content_hash"], entry.get("size"), entry.get("mtime_ns"))
             for entry in prev.get("files", [])
             if "content_hash" in entry
         }
-    except (json.JSONDecodeError, KeyError):
+    except (JSONDecodeError, KeyError, FileNotFoundError):
         return {}
 
 
-def _detect_changes(parsed: list[ParsedFile], prev_hashes: dict[str, str]) -> dict[str, str]:
-    """Compare current files against previous hashes. Returns {filename: 'new'|'changed'|'unchanged'}."""
-    changes = {}
-    for pf in parsed:
-        if pf.error or pf.is_image:
-            continue
-        current_hash = compute_file_hash(pf.text)
-        if pf.filename not in prev_hashes:
-            changes[pf.filename] = "new"
-        elif prev_hashes[pf.filename] != current_hash:
-            changes[pf.filename] = "changed"
+def _detect_changes(text_files: list[ParsedFile], prev_hashes: dict[str, tuple],
+                    hashes: dict[str, str]) -> tuple[list[str], list[str], set[str]]:
+    """Compare current hashes against previous ones. Returns (new, changed, unchanged) filenames."""
+    new, changed, unchanged = [], [], set()
+    for filename in dict.fromkeys(pf.filename for pf in text_files):
+        prev = prev_hashes.get(filename)
+        if prev is None:
+            new.append(filename)
+        elif prev[0] != hashes[filename]:
+            changed.append(filename)
         else:
-            changes[pf.filename] = "unchanged"
-    return changes
+            unchanged.add(filename)
+    return new, changed, unchanged
@@ -8,10 +8,15 @@ Creates Epics → Features → User Stories (with discipline Tasks) in ADO.
 Reliability features:
 - Resume: loads existing ado_mapping.json and skips already-created items
 - Dedup: queries ADO for existing Epics/Features before creating new ones
-- Incremental save: writes ado_mapping.json after each story creation
+- Incremental save: writes ado_mapping.json every few stories (atomic replace)
+- Concurrency: stories within a feature are created in parallel
 """
 
-import json
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html import escape as _html_escape
 from pathlib import Path
 
 import click
@@ -19,12 +24,31 @@ import click
 from core.config import get_output_path, update_state
 from core.context import invalidate_downstream
 from core.events import append_event
+from core.jsonio import JSONDecodeError, read_json, write_json
 from core import ado as ado_client
 from core.usage import log_operation
 
+# Incremental ado_mapping.json saves: every N stories or T seconds, whichever first
+_MAPPING_SAVE_EVERY = 10
+_MAPPING_SAVE_INTERVAL = 2.0
+_unsaved_stories = 0
+_last_mapping_save = 0.0
+
+# How long a cached Epic/Feature dedup query stays valid, in seconds
+_EXISTING_CACHE_TTL = 300
+# Max characters per WIQL query; ADO rejects queries over 32K
+_WIQL_MAX_LENGTH = 30000
+
 
 def run(proj: dict, dry_run: bool = False) -> None:
     """Push stories to Azure DevOps from push_ready.json (or breakdown.json fallback)."""
+    try:
+        _run(proj, dry_run)
+    finally:
+        ado_client.close_connections()
+
+
+def _run(proj: dict, dry_run: bool) -> None:
     project_name = proj["project"]
     click.secho(f"\n  Pushing to Azure DevOps for '{project_name}'", bold=True)
 
@@ -68,33 +92,24 @@ def run(proj: dict, dry_run: bool = False) -> None:
             click.secho(f"  ⚠ Could not create repository: {e}", fg="yellow")
             click.echo("    Feature code generation will need a repo later.")
 
-        # Query existing Epics/Features to avoid creating duplicates
+    # Load existing mapping for resume support (survives partial failures)
+    created = _load_existing_mapping(proj)
+
+    # Query existing Epics/Features to avoid creating duplicates — not
+    # needed when the resume mapping already resolves every one of them
+    lookup_titles = set() if dry_run else _unresolved_titles(push_data, created)
+    if lookup_titles:
         click.echo("  Checking for existing work items...")
-        existing_items = _fetch_existing_items(config)
+        existing_items = _fetch_existing_items(config, proj, lookup_titles)
         e_count = len(existing_items["epics"])
         f_count = len(existing_items["features"])
         if e_count or f_count:
             click.echo(f"    Found {e_count} epics, {f_count} features already in ADO")
 
-    # Load existing mapping for resume support (survives partial failures)
-    created = _load_existing_mapping(proj)
     created_story_ids = {s["id"] for s in created.get("stories", [])}
 
     # Count totals and determine what's already done
-    total_stories = sum(
-        len(feature.get("stories", []))
-        for epic in push_data.get("epics", [])
-        for feature in epic.get("features", [])
-    )
-    total_epics = len(push_data.get("epics", []))
-    total_features = sum(len(e.get("features", [])) for e in push_data.get("epics", []))
-
-    skip_count = sum(
-        1 for epic in push_data.get("epics", [])
-        for feature in epic.get("features", [])
-        for story in feature.get("stories", [])
-        if story.get("id", "") in created_story_ids
-    )
+    total_epics, total_features, total_stories, skip_count = _tally(push_data, created_story_ids)
 
     click.echo(f"\n  Total: {total_epics} epics, {total_features} features, {total_stories} stories")
     if skip_count:
@@ -108,6 +123,7 @@ def run(proj: dict, dry_run: bool = False) -> None:
 
     # Main creation loop
     story_index = 0
+    stories_by_id: dict[str, tuple[dict, str, str]] = {}  # local ID → (story, epic, feature)
     new_story_count = 0
 
     for epic in push_data.get("epics", []):
@@ -115,15 +131,6 @@ def run(proj: dict, dry_run: bool = False) -> None:
         epic_id_key = epic.get("id", epic_name)
         epic_desc = epic.get("description", "")
 
-        feature_names = [f.get("name", "?") for f in epic.get("features", [])]
-        epic_html = (
-            f"<h3>{epic_name}</h3>"
-            f"<p>{epic_desc}</p>"
-            f"<p><b>Features:</b></p><ul>"
-            + "".join(f"<li>{fn}</li>" for fn in feature_names)
-            + "</ul>"
-        )
-
         click.secho(f"\n  Epic: {epic_name}", fg="cyan", bold=True)
 
         # Resolve Epic: resume mapping → existing in ADO → create new
@@ -138,6 +145,14 @@ def run(proj: dict, dry_run: bool = False) -> None:
             created["epics"][epic_id_key] = epic_ado_id
             click.echo(f"    ↩ Reusing existing ADO Epic #{epic_ado_id}")
         else:
+            # Built only here: reused or dry-run epics never send a body
+            feature_items = "".join(
+                f"<li>{_esc(f.get('name', '?'))}</li>" for f in epic.get("features", [])
+            )
+            epic_html = (
+                f"<h3>{_esc(epic_name)}</h3><p>{_esc(epic_desc)}</p>"
+                f"<p><b>Features:</b></p><ul>{feature_items}</ul>"
+            )
             result = ado_client.create_work_item(
                 config, "Epic", epic_name,
                 description=epic_html,
@@ -145,20 +160,15 @@ def run(proj: dict, dry_run: bool = False) -> None:
             )
             epic_ado_id = result.get("id")
             created["epics"][epic_id_key] = epic_ado_id
+            # Persist at once so a rerun after a later failure reuses it
+            _forget_existing_items(proj)
+            _save_mapping(proj, created, force=True)
             click.echo(f"    ✓ Created Epic #{epic_ado_id}")
 
         for feature in epic.get("features", []):
             feat_name = feature.get("name", "Unknown Feature")
             feat_id_key = feature.get("id", feat_name)
 
-            story_names = [s.get("title", "?") for s in feature.get("stories", [])]
-            feat_html = (
-                f"<h4>{feat_name}</h4>"
-                f"<p><b>Stories:</b></p><ul>"
-                + "".join(f"<li>{sn}</li>" for sn in story_names)
-                + "</ul>"
-            )
-
             click.echo(f"    Feature: {feat_name}")
 
             # Resolve Feature: resume mapping → existing in ADO → create new
@@ -173,6 +183,13 @@ def run(proj: dict, dry_run: bool = False) -> None:
                 created["features"][feat_id_key] = feat_ado_id
                 click.echo(f"      ↩ Reusing existing ADO Feature #{feat_ado_id}")
             else:
+                story_items = "".join(
+                    f"<li>{_esc(s.get('title', '?'))}</li>" for s in feature.get("stories", [])
+                )
+                feat_html = (
+                    f"<h4>{_esc(feat_name)}</h4>"
+                    f"<p><b>Stories:</b></p><ul>{story_items}</ul>"
+                )
                 result = ado_client.create_work_item(
                     config, "Feature", feat_name,
                     description=feat_html,
@@ -181,12 +198,16 @@ def run(proj: dict, dry_run: bool = False) -> None:
                 )
                 feat_ado_id = result.get("id")
                 created["features"][feat_id_key] = feat_ado_id
+                _forget_existing_items(proj)
+                _save_mapping(proj, created, force=True)
                 click.echo(f"      ✓ Created Feature #{feat_ado_id}")
 
+            pending = []
             for story in feature.get("stories", []):
                 story_index += 1
                 story_title = story.get("title", "Unknown Story")
                 story_id = story.get("id", f"US-{story_index:03d}")
+                stories_by_id[story_id] = (story, epic_name, feat_name)
 
                 # Skip if already created (resume support)
                 if story_id in created_story_ids:
@@ -196,8 +217,6 @@ def run(proj: dict, dry_run: bool = False) -> None:
                     )
                     continue
 
-                click.echo(f"      [{story_index}/{total_stories}] {story_title}")
-
                 # Read user story and AC from push_ready.json fields;
                 # fallback: breakdown.json has acceptance_criteria as a string
                 user_story_text = story.get("user_story", f"As a user,\nI want to {story_title.lower()},\nSo that I can accomplish this goal.")
@@ -218,37 +237,55 @@ def run(proj: dict, dry_run: bool = False) -> None:
                 ac_html = _build_ac_html(ac_list, tech_ctx)
 
                 if dry_run:
+                    click.echo(f"      [{story_index}/{total_stories}] {story_title}")
                     click.echo(f"        [DRY RUN] Would create User Story: {story_title}")
                     click.echo(f"        User story: {user_story_text[:100]}...")
                 else:
-                    result = ado_client.create_work_item(
-                        config, "User Story", story_title,
-                        description=description_html,
-                        tags="Claude New Story",
-                        parent_id=feat_ado_id,
-                        extra_fields={
-                            "Microsoft.VSTS.Scheduling.Effort": total,
-                            "Microsoft.VSTS.Common.AcceptanceCriteria": ac_html,
-                        },
-                    )
-                    story_ado_id = result.get("id")
-                    click.secho(f"        ✓ Created Story #{story_ado_id}", fg="green")
+                    pending.append((story_index, story_id, story_title, story,
+                                    description_html, ac_html, total))
 
-                    # Create discipline tasks
-                    _create_tasks(config, project_name, story_ado_id, story_title, story)
+            if not pending:
+                continue
 
-                    created["stories"].append({
-                        "ado_id": story_ado_id,
-                        "id": story_id,
-                        "title": story_title,
-                        "epic": epic_name,
-                        "feature": feat_name,
-                    })
-                    created_story_ids.add(story_id)
-                    new_story_count += 1
-
-                    # Save mapping incrementally — progress survives failures
-                    _save_mapping(proj, created)
+            # Stories under one feature are independent once the feature
+            # exists, so create them (and their tasks) concurrently.
+            # Results are reported and saved in input order.
+            first_error = None
+            try:
+                with ThreadPoolExecutor(max_workers=ado_client.MAX_WORKERS) as pool:
+                    futures = [
+                        pool.submit(_create_story_with_tasks, config, project_name, feat_ado_id,
+                                    story_title, story, description_html, ac_html, total)
+                        for _, _, story_title, story, description_html, ac_html, total in pending
+                    ]
+                    for (idx, story_id, story_title, *_), future in zip(pending, futures):
+                        click.echo(f"      [{idx}/{total_stories}] {story_title}")
+                        try:
+                            story_ado_id = future.result()
+                        except Exception as e:
+                            click.secho(f"        ✗ Failed to create story: {e}", fg="red")
+                            first_error = first_error or e
+                            continue
+                        click.secho(f"        ✓ Created Story #{story_ado_id}", fg="green")
+
+                        created["stories"].append({
+                            "ado_id": story_ado_id,
+                            "id": story_id,
+                            "title": story_title,
+                            "epic": epic_name,
+                            "feature": feat_name,
+                        })
+                        created_story_ids.add(story_id)
+                        new_story_count += 1
+
+                        # Save mapping incrementally — progress survives failures
+                        _save_mapping(proj, created, force=False)
+            finally:
+                # Flush whatever the debounce held back, even on error or Ctrl+C
+                _save_mapping(proj, created, force=True)
+
+            if first_error is not None:
+                raise first_error
 
     # Final mapping save (captures Epic/Feature-only changes from reuse)
     _save_mapping(proj, created)
@@ -256,7 +293,8 @@ def run(proj: dict, dry_run: bool = False) -> None:
 
     # Create story relation links (predecessors + similar stories)
     if not dry_run:
-        _create_relation_links(config, push_data, created)
+        id_to_ado = {info["id"]: info["ado_id"] for info in created.get("stories", [])}
+        _create_relation_links(config, stories_by_id, id_to_ado)
 
     # Attach reference source files to stories
     if not dry_run:
@@ -305,22 +343,74 @@ def run(proj: dict, dry_run: bool = False) -> None:
 
 # --- Resume and dedup helpers ---
 
-def _fetch_existing_items(config) -> dict:
-    """Fetch existing Epics and Features from ADO for duplicate detection.
+def _tally(push_data: dict, created_story_ids: set[str]) -> tuple[int, int, int, int]:
+    """Count epics, features and stories in one pass, plus stories already created.
 
-    Only queries the current project to avoid cross-project matches.
+    Returns (total_epics, total_features, total_stories, skip_count).
+    """
+    total_epics = total_features = total_stories = skip_count = 0
+    for epic in push_data.get("epics", []):
+        total_epics += 1
+        for feature in epic.get("features", []):
+            total_features += 1
+            for story in feature.get("stories", []):
+                total_stories += 1
+                if story.get("id", "") in created_story_ids:
+                    skip_count += 1
+    return total_epics, total_features, total_stories, skip_count
+
+
+def _unresolved_titles(push_data: dict, created: dict) -> set[str]:
+    """Names of Epics and Features in push_data that the resume mapping doesn't cover."""
+    titles = set()
+    for epic in push_data.get("epics", []):
+        epic_name = epic.get("name", "Unknown Epic")
+        if epic.get("id", epic_name) not in created["epics"]:
+            titles.add(epic_name)
+        for feature in epic.get("features", []):
+            feat_name = feature.get("name", "Unknown Feature")
+            if feature.get("id", feat_name) not in created["features"]:
+                titles.add(feat_name)
+    return titles
+
+
+def _fetch_existing_items(config, proj: dict, titles: set[str]) -> dict:
+    """Fetch existing Epics and Features with the given titles for duplicate detection.
+
+    Only queries the current project to avoid cross-project matches, and
+    filters by title server-side so the response scales with the push, not
+    the project. A successful result is cached in ado_existing_cache.json
+    for _EXISTING_CACHE_TTL seconds and reused when it covers all titles.
     Returns {"epics": {title: ado_id}, "features": {title: ado_id}}.
     """
     project = config.project
-    wiql = (
+    cache_path = get_output_path(proj, "ado_existing_cache.json")
+    try:
+        if time.time() - cache_path.stat().st_mtime < _EXISTING_CACHE_TTL:
+            cached = read_json(cache_path)
+            if cached.get("project") == project and titles <= set(cached["titles"]):
+                return cached["items"]
+    except (OSError, JSONDecodeError, KeyError, AttributeError, TypeError):
+        pass
+
+    ordered = sorted(titles)
+    wiql_head = (
         "SELECT [System.Id], [System.Title], [System.WorkItemType] "
         "FROM WorkItems WHERE [System.WorkItemType] IN ('Epic', 'Feature') "
         "AND [System.State] <> 'Removed' "
         f"AND [System.TeamProject] = '{project}' "
-        "ORDER BY [System.Id] ASC"
+        "AND [System.Title] IN ("
     )
+    wiql_tail = ") ORDER BY [System.Id] ASC"
+    title_budget = _WIQL_MAX_LENGTH - len(wiql_head) - len(wiql_tail)
+    items = []
     try:
-        items = ado_client.get_work_items_by_query(config, wiql)
+        for quoted in _quoted_title_chunks(ordered, title_budget):
+            wiql = wiql_head + quoted + wiql_tail
+            items.extend(ado_client.get_work_items_by_query(
+                config, wiql,
+                fields=["System.Id", "System.Title", "System.WorkItemType"],
+            ))
     except Exception as e:
         click.secho(f"    ⚠ Could not query existing items: {e}", fg="yellow")
         return {"epics": {}, "features": {}}
@@ -337,7 +427,33 @@ def _fetch_existing_items(config) -> dict:
         elif wit == "Feature":
             features[title] = ado_id
 
-    return {"epics": epics, "features": features}
+    existing = {"epics": epics, "features": features}
+    write_json(cache_path, {"project": project, "titles": ordered, "items": existing})
+    return existing
+
+
+def _forget_existing_items(proj: dict) -> None:
+    """Drop the cached dedup query; it no longer reflects ADO once we create an Epic/Feature."""
+    get_output_path(proj, "ado_existing_cache.json").unlink(missing_ok=True)
+
+
+def _quoted_title_chunks(titles: list[str], max_length: int):
+    """Yield WIQL-quoted, comma-separated title lists of at most max_length chars.
+
+    A single title longer than max_length still gets a list of its own.
+    """
+    chunk = []
+    length = 0
+    for title in titles:
+        quoted = "'" + title.replace("'", "''") + "'"
+        if chunk and length + len(quoted) + 2 > max_length:
+            yield ", ".join(chunk)
+            chunk = []
+            length = 0
+        length += len(quoted) + (2 if chunk else 0)
+        chunk.append(quoted)
+    if chunk:
+        yield ", ".join(chunk)
 
 
 def _load_existing_mapping(proj: dict) -> dict:
@@ -349,134 +465,197 @@ def _load_existing_mapping(proj: dict) -> dict:
     mapping_path = get_output_path(proj, "ado_mapping.json")
     if mapping_path.exists():
         try:
-            with open(mapping_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(mapping_path)
             # Validate structure
             if (isinstance(data.get("epics"), dict)
                     and isinstance(data.get("features"), dict)
                     and isinstance(data.get("stories"), list)):
                 return data
-        except (json.JSONDecodeError, KeyError):
+        except (JSONDecodeError, KeyError):
             pass
     return {"epics": {}, "features": {}, "stories": []}
 
 
-def _save_mapping(proj: dict, created: dict) -> None:
-    """Save ado_mapping.json incrementally after each story creation."""
+def _save_mapping(proj: dict, created: dict, force: bool = True) -> None:
+    """Save ado_mapping.json atomically.
+
+    With force=False the save is debounced: it only happens every
+    _MAPPING_SAVE_EVERY stories or _MAPPING_SAVE_INTERVAL seconds, so a long
+    push doesn't rewrite the whole mapping after every story.
+    """
+    global _unsaved_stories, _last_mapping_save
+    if not force:
+        _unsaved_stories += 1
+        if (_unsaved_stories < _MAPPING_SAVE_EVERY
+                and time.monotonic() - _last_mapping_save < _MAPPING_SAVE_INTERVAL):
+            return
+
     mapping_path = get_output_path(proj, "ado_mapping.json")
-    with open(mapping_path, "w", encoding="utf-8") as f:
-        json.dump(created, f, indent=2)
+    tmp_path = mapping_path.with_name(mapping_path.name + ".tmp")
+    write_json(tmp_path, created)
+    os.replace(tmp_path, mapping_path)
+    _unsaved_stories = 0
+    _last_mapping_save = time.monotonic()
 
 
 # --- Task and relation helpers ---
 
+# (effort field, task title prefix) for per-discipline tasks
+_DISCIPLINES = (
+    ("fe_days", "FE"),
+    ("be_days", "BE"),
+    ("devops_days", "DevOps"),
+)
+
+
+def _create_story_with_tasks(config, project_name: str, feat_ado_id: int,
+                             story_title: str, story: dict, description_html: str,
+                             ac_html: str, total: int | float) -> int:
+    """Create one User Story under its feature plus its discipline tasks.
+
+    Returns the new story's ADO ID.
+    """
+    result = ado_client.create_work_item(
+        config, "User Story", story_title,
+        description=description_html,
+        tags="Claude New Story",
+        parent_id=feat_ado_id,
+        extra_fields={
+            "Microsoft.VSTS.Scheduling.Effort": total,
+            "Microsoft.VSTS.Common.AcceptanceCriteria": ac_html,
+        },
+    )
+    story_ado_id = result.get("id")
+    _create_tasks(config, project_name, story_ado_id, story_title, story)
+    return story_ado_id
+
+
 def _create_tasks(config, project_name: str, parent_id: int,
                    story_title: str, story: dict) -> None:
-    """Create FE / BE / DevOps / QA tasks as children of the user story."""
-    disciplines = [
-        ("fe_days", "FE"),
-        ("be_days", "BE"),
-        ("devops_days", "DevOps"),
-    ]
-    for field, prefix in disciplines:
-        days = story.get(field, 0)
+    """Create FE / BE / DevOps / QA tasks as children of the user story.
+
+    All of a story's tasks go to ADO in one $batch call.
+    """
+    tasks = []  # (label for warnings, create_work_items_batch entry)
+    get = story.get
+    for field, prefix in _DISCIPLINES:
+        days = get(field, 0)
         if days and days > 0:
-            task_title = f"[{prefix}] {story_title}"
-            try:
-                ado_client.create_work_item(
-                    config, "Task", task_title,
-                    parent_id=parent_id,
-                    tags="Claude New Story",
-                    extra_fields={
-                        "Microsoft.VSTS.Scheduling.Effort": days,
-                    },
-                )
-            except Exception as e:
-                click.secho(f"          ⚠ Failed to create {prefix} task: {e}", fg="yellow")
+            tasks.append((f"{prefix} task", {
+                "work_item_type": "Task",
+                "title": f"[{prefix}] {story_title}",
+                "parent_id": parent_id,
+                "tags": "Claude New Story",
+                "extra_fields": {
+                    "Microsoft.VSTS.Scheduling.Effort": days,
+                },
+            }))
 
     # QA tasks — only for testable stories (skip_qa flag set by Claude
     # during story generation for purely technical stories with no end-user impact)
     if not story.get("skip_qa", False):
         # [QA][TD] — Test Design with manual test cases in description
-        td_title = f"[QA][TD] {story_title}"
-        td_description = story.get("qa_td_description", "")
-        try:
-            ado_client.create_work_item(
-                config, "Task", td_title,
-                parent_id=parent_id,
-                description=td_description,
-                tags="Claude New Story",
-            )
-        except Exception as e:
-            click.secho(f"          ⚠ Failed to create [QA][TD] task: {e}", fg="yellow")
-
+        tasks.append(("[QA][TD] task", {
+            "work_item_type": "Task",
+            "title": f"[QA][TD] {story_title}",
+            "parent_id": parent_id,
+            "description": story.get("qa_td_description", ""),
+            "tags": "Claude New Story",
+        }))
         # [QA][TE] — Test Execution time-tracking placeholder (no description)
-        te_title = f"[QA][TE] {story_title}"
-        try:
-            ado_client.create_work_item(
-                config, "Task", te_title,
-                parent_id=parent_id,
-                tags="Claude New Story",
-            )
-        except Exception as e:
-            click.secho(f"          ⚠ Failed to create [QA][TE] task: {e}", fg="yellow")
+        tasks.append(("[QA][TE] task", {
+            "work_item_type": "Task",
+            "title": f"[QA][TE] {story_title}",
+            "parent_id": parent_id,
+            "tags": "Claude New Story",
+        }))
+
+    if not tasks:
+        return
 
+    try:
+        results = ado_client.create_work_items_batch(config, [entry for _, entry in tasks])
+    except Exception as e:
+        results = [{"error": str(e)}] * len(tasks)
+
+    for (label, _), result in zip(tasks, results):
+        if "error" in result:
+            click.secho(f"          ⚠ Failed to create {label}: {result['error']}", fg="yellow")
 
-def _create_relation_links(config, push_data: dict, created: dict) -> None:
+
+def _create_relation_links(config, stories_by_id: dict[str, tuple[dict, str, str]],
+                           id_to_ado: dict[str, int]) -> None:
     """Create predecessor and similar-story links between ADO work items.
 
-    Reads 'predecessors' and 'similar_stories' arrays from each story in
-    push_data, maps local IDs (e.g. US-001) to ADO IDs using the created
-    mapping, and creates the appropriate ADO links.
+    Reads 'predecessors' and 'similar_stories' arrays from each indexed story,
+    maps local IDs (e.g. US-001) to ADO IDs using id_to_ado, and creates the
+    appropriate ADO links.
     """
-    # Build local ID → ADO ID mapping
-    id_to_ado = {}
-    for story_info in created.get("stories", []):
-        id_to_ado[story_info["id"]] = story_info["ado_id"]
-
     link_count = 0
+    # (local ID, ADO ID, links) for every story that has any
+    pending: list[tuple[str, int, list[tuple]]] = []
 
-    for epic in push_data.get("epics", []):
-        for feature in epic.get("features", []):
-            for story in feature.get("stories", []):
-                story_local_id = story.get("id", "")
-                story_ado_id = id_to_ado.get(story_local_id)
-                if not story_ado_id:
-                    continue
+    for story_local_id, (story, _, _) in stories_by_id.items():
+        story_ado_id = id_to_ado.get(story_local_id)
+        if not story_ado_id:
+            continue
 
-                # Predecessor links
-                for pred_id in story.get("predecessors", []):
-                    pred_ado_id = id_to_ado.get(pred_id)
-                    if pred_ado_id:
-                        try:
-                            ado_client.add_link(
-                                config, story_ado_id, pred_ado_id,
-                                "System.LinkTypes.Dependency-Reverse",
-                                comment="Predecessor: feature builds on this story's output",
-                            )
-                            link_count += 1
-                        except Exception as e:
-                            click.secho(
-                                f"    ⚠ Failed to link {story_local_id} → predecessor {pred_id}: {e}",
-                                fg="yellow",
-                            )
-
-                # Similar story links
-                for sim_id in story.get("similar_stories", []):
-                    sim_ado_id = id_to_ado.get(sim_id)
-                    if sim_ado_id:
-                        try:
-                            ado_client.add_link(
-                                config, story_ado_id, sim_ado_id,
-                                "System.LinkTypes.Related",
-                                comment="Similar: same pattern/approach as this story",
-                            )
-                            link_count += 1
-                        except Exception as e:
-                            click.secho(
-                                f"    ⚠ Failed to link {story_local_id} → similar {sim_id}: {e}",
-                                fg="yellow",
-                            )
+        # (target ADO ID, link type, comment, label for warnings)
+        links = []
+        for pred_id in story.get("predecessors", []):
+            pred_ado_id = id_to_ado.get(pred_id)
+            if pred_ado_id:
+                links.append((
+                    pred_ado_id, "System.LinkTypes.Dependency-Reverse",
+                    "Predecessor: feature builds on this story's output",
+                    f"predecessor {pred_id}",
+                ))
+        for sim_id in story.get("similar_stories", []):
+            sim_ado_id = id_to_ado.get(sim_id)
+            if sim_ado_id:
+                links.append((
+                    sim_ado_id, "System.LinkTypes.Related",
+                    "Similar: same pattern/approach as this story",
+                    f"similar {sim_id}",
+                ))
+        if links:
+            # same ID listed twice → one link
+            pending.append((story_local_id, story_ado_id, list(dict.fromkeys(links))))
+
+    if not pending:
+        return
+
+    # Every story's links in one $batch call, one atomic patch per story
+    items = [
+        {"id": story_ado_id, "links": [(target, rel, comment) for target, rel, comment, _ in links]}
+        for _, story_ado_id, links in pending
+    ]
+    try:
+        results = ado_client.update_work_items_batch(config, items)
+    except Exception as e:
+        results = [{"error": str(e)}] * len(items)
+
+    for (story_local_id, story_ado_id, links), result in zip(pending, results):
+        if "error" not in result:
+            link_count += len(links)
+            continue
+        if len(links) == 1:
+            click.secho(
+                f"    ⚠ Failed to link {story_local_id} → {links[0][3]}: {result['error']}",
+                fg="yellow",
+            )
+            continue
+        # A story's patch is all-or-nothing (e.g. one link already exists
+        # from a previous run), so retry link by link
+        for target, rel, comment, label in links:
+            try:
+                ado_client.add_link(config, story_ado_id, target, rel, comment=comment)
+                link_count += 1
+            except Exception as e:
+                click.secho(
+                    f"    ⚠ Failed to link {story_local_id} → {label}: {e}",
+                    fg="yellow",
+                )
 
     if link_count > 0:
         click.secho(f"    ✓ Created {link_count} story relation links", fg="green")
@@ -563,20 +742,44 @@ def _attach_reference_sources(config, proj: dict, push_data: dict, created: dict
 
 
 # --- HTML builders ---
+#
+# Sibling stories often share reference sources, AC groups and technical
+# context, so the builders normalise their inputs to hashable tuples and
+# memoise the rendered HTML.
+
+_TECH_CONTEXT_SECTIONS = (
+    ("Data Model", "data_model"),
+    ("States", "states"),
+    ("Interactions", "interactions"),
+    ("Navigation", "navigation"),
+    ("API Hints", "api_hints"),
+)
+
+
+def _esc(value) -> str:
+    """HTML-escape text content from push data (quotes are left as-is)."""
+    return _html_escape(str(value), quote=False)
+
 
 def _build_story_description(user_story: str, epic: str, feature: str,
                               reference_sources: list[str] | None = None) -> str:
     """Build HTML description — user story text + optional reference sources."""
+    try:
+        return _story_description_cached(user_story, tuple(reference_sources or ()))
+    except TypeError:  # unhashable source entries — render without caching
+        return _story_description_cached.__wrapped__(user_story, reference_sources or ())
+
+
+@functools.lru_cache(maxsize=1024)
+def _story_description_cached(user_story: str, reference_sources: tuple) -> str:
     # Convert newlines to <br> for three-line display — no extra \n or <p> wrapper
     # to avoid ADO rendering extra gaps between lines
-    html_text = user_story.replace("\n", "<br>")
+    html_text = _esc(user_story).replace("\n", "<br>")
 
     # Append reference sources if provided
     if reference_sources:
-        html_text += "<br><br><b>Reference Sources:</b><br><ol>"
-        for src in reference_sources:
-            html_text += f"<li>{src}</li>"
-        html_text += "</ol>"
+        sources = "".join(f"<li>{_esc(src)}</li>" for src in reference_sources)
+        html_text += f"<br><br><b>Reference Sources:</b><br><ol>{sources}</ol>"
 
     return html_text
 
@@ -591,34 +794,57 @@ def _build_ac_html(ac_list, technical_context: dict | None = None) -> str:
     - New: list of dicts with 'title' and 'items' keys
     - Legacy: list of strings or a single string
     """
+    ac_key = _ac_key(ac_list)
+    ctx_key = _tech_context_key(technical_context) if technical_context else ()
+    try:
+        return _ac_html_cached(ac_key, ctx_key)
+    except TypeError:  # unhashable items — render without caching
+        return _ac_html_cached.__wrapped__(ac_key, ctx_key)
+
+
+def _ac_key(ac_list) -> tuple:
+    """Normalise an AC list into a tuple that _ac_html_cached can render."""
     if isinstance(ac_list, str):
-        ac_html = f"<p>{ac_list}</p>"
-    elif isinstance(ac_list, list) and ac_list:
-        # New structured format: list of {title, items}
+        return ("text", ac_list)
+    if isinstance(ac_list, list) and ac_list:
         if isinstance(ac_list[0], dict):
-            parts = []
-            for i, group in enumerate(ac_list, 1):
-                title = group.get("title", f"Criterion {i}")
-                items_html = "".join(
-                    f"<li>{item}</li>" for item in group.get("items", [])
-                )
-                parts.append(
-                    f"<b>AC {i}:</b> {title}<br><ul>{items_html}</ul>"
-                )
-            ac_html = "".join(parts)
-        else:
-            # Legacy format: list of strings
-            parts = []
-            for i, ac in enumerate(ac_list, 1):
-                if ac:
-                    parts.append(f"<b>AC {i}:</b> {ac}<br><ul><li>{ac}</li></ul>")
-            ac_html = "".join(parts)
+            return ("groups", tuple(
+                (group.get("title", f"Criterion {i}"), tuple(group.get("items", [])))
+                for i, group in enumerate(ac_list, 1)
+            ))
+        return ("legacy", tuple(ac_list))
+    return ("empty",)
+
+
+def _tech_context_key(ctx: dict) -> tuple:
+    """Normalise a technical_context dict into (title, items) pairs."""
+    return tuple((title, tuple(ctx.get(key, []))) for title, key in _TECH_CONTEXT_SECTIONS)
+
+
+@functools.lru_cache(maxsize=1024)
+def _ac_html_cached(ac_key: tuple, ctx_key: tuple) -> str:
+    kind = ac_key[0]
+    if kind == "text":
+        ac_html = f"<p>{_esc(ac_key[1])}</p>"
+    elif kind == "groups":
+        # New structured format: list of {title, items}
+        ac_html = "".join(
+            f"<b>AC {i}:</b> {_esc(title)}<br>"
+            f"<ul>{''.join(f'<li>{_esc(item)}</li>' for item in items)}</ul>"
+            for i, (title, items) in enumerate(ac_key[1], 1)
+        )
+    elif kind == "legacy":
+        # Legacy format: list of strings
+        ac_html = "".join(
+            f"<b>AC {i}:</b> {_esc(ac)}<br><ul><li>{_esc(ac)}</li></ul>"
+            for i, ac in enumerate(ac_key[1], 1) if ac
+        )
     else:
         ac_html = "<p>To be defined when designs are ready.</p>"
 
     # Append technical context block if present
-    if technical_context:
-        ac_html += _build_technical_context_html(technical_context)
+    if ctx_key:
+        ac_html += _technical_context_html(ctx_key)
 
     return ac_html
 
@@ -630,25 +856,18 @@ def _build_technical_context_html(ctx: dict) -> str:
     generation. It provides data model, states, interactions, navigation,
     and API hints so the generated code is complete from the start.
     """
-    sections = [
-        ("Data Model", ctx.get("data_model", [])),
-        ("States", ctx.get("states", [])),
-        ("Interactions", ctx.get("interactions", [])),
-        ("Navigation", ctx.get("navigation", [])),
-        ("API Hints", ctx.get("api_hints", [])),
-    ]
+    return _technical_context_html(_tech_context_key(ctx))
+
 
+def _technical_context_html(sections: tuple) -> str:
     # Skip if all sections are empty
     if not any(items for _, items in sections):
         return ""
 
-    parts = ['<hr><b>Technical Context</b><br><br>']
-    for title, items in sections:
-        if items:
-            items_html = "".join(f"<li>{item}</li>" for item in items)
-            parts.append(f"<b>{title}:</b><br><ul>{items_html}</ul>")
-
-    return "".join(parts)
+    return '<hr><b>Technical Context</b><br><br>' + "".join(
+        f"<b>{title}:</b><br><ul>{''.join(f'<li>{_esc(item)}</li>' for item in items)}</ul>"
+        for title, items in sections if items
+    )
 
 
 # --- Data loading ---
@@ -657,26 +876,26 @@ def _load_data(proj: dict) -> tuple[dict | None, str]:
     """Load push_ready.json, falling back to breakdown.json."""
     # Try push_ready.json first
     pr_path = get_output_path(proj, "push_ready.json")
-    if pr_path.exists():
-        try:
-            with open(pr_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if "epics" in data:
-                return data, "push_ready.json"
-        except json.JSONDecodeError as e:
-            click.secho(f"  ⚠ Failed to parse push_ready.json: {e}", fg="yellow")
+    try:
+        data = read_json(pr_path)
+        if "epics" in data:
+            return data, "push_ready.json"
+    except FileNotFoundError:
+        pass
+    except JSONDecodeError as e:
+        click.secho(f"  ⚠ Failed to parse push_ready.json: {e}", fg="yellow")
 
     # Fallback to breakdown.json
     bd_path = get_output_path(proj, "breakdown.json")
-    if bd_path.exists():
-        try:
-            with open(bd_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if "epics" in data:
-                click.secho("  ℹ Using breakdown.json (push_ready.json not found)", fg="yellow")
-                return data, "breakdown.json"
-        except json.JSONDecodeError as e:
-            click.secho(f"  ✗ Failed to parse breakdown.json: {e}", fg="red")
+    try:
+        data = read_json(bd_path)
+        if "epics" in data:
+            click.secho("  ℹ Using breakdown.json (push_ready.json not found)", fg="yellow")
+            return data, "breakdown.json"
+    except FileNotFoundError:
+        pass
+    except JSONDecodeError as e:
+        click.secho(f"  ✗ Failed to parse breakdown.json: {e}", fg="red")
 
     click.secho("  ✗ No data source found.", fg="red")
     click.echo("    Generate push_ready.json in conversation, or ensure breakdown.json exists.")
@@ -5,7 +5,12 @@ informed each user story. Uploads source files as wiki attachments so they
 are downloadable directly from the page.
 """
 
-import json
+import hashlib
+import io
+import mmap
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -13,10 +18,19 @@ import click
 
 from core.config import get_output_path, get_input_dir, get_answers_dir, get_changes_dir
 from core import ado as ado_client
+from core.jsonio import JSONDecodeError, dumps, read_json, write_json
 from core.usage import log_operation
 
 
-def run(proj: dict) -> None:
+# Fingerprint of the inputs behind the last published RTM page
+_FINGERPRINT_FILE = ".rtm_fingerprint"
+# Content hash and wiki path of each attachment from earlier uploads
+_ATTACHMENTS_FILE = ".rtm_attachments.json"
+# Wiki ID resolved on an earlier run, so later runs skip the wiki lookup
+_STATE_FILE = ".rtm_state.json"
+
+
+def run(proj: dict, force: bool = False) -> None:
     """Standalone entry point for `xproject rtm <project>`."""
     project_name = proj["project"]
     click.secho(f"\n  Generating RTM wiki page for '{project_name}'", bold=True)
@@ -43,7 +57,7 @@ def run(proj: dict) -> None:
         return
     click.secho("  ✓ Connected to ADO", fg="green")
 
-    _generate_and_publish(proj, config, push_data, ado_mapping)
+    _generate_and_publish(proj, config, push_data, ado_mapping, force=force)
 
     # Log usage
     stats = ado_client.get_call_stats()
@@ -77,8 +91,13 @@ def _generate_and_publish(
     config: ado_client.AdoConfig,
     push_data: dict,
     ado_mapping: dict,
+    force: bool = False,
 ) -> None:
-    """Core logic: build RTM data, upload attachments, render markdown, upsert wiki page."""
+    """Core logic: build RTM data, upload attachments, render markdown, upsert wiki page.
+
+    Skipped when the stories, mapping and source files are unchanged since
+    the last successful publish, unless force is set.
+    """
     project_name = proj["project"]
 
     # Scan source files on disk
@@ -93,20 +112,113 @@ def _generate_and_publish(
     traced = rtm_data["total_stories"] - len(rtm_data["untraced_stories"])
     click.echo(f"  Coverage: {traced}/{rtm_data['total_stories']} stories traced")
 
-    # Find or create wiki
-    wiki_id = _find_or_create_wiki(config)
-    if not wiki_id:
-        click.secho("  ✗ Could not find or create a wiki", fg="red")
+    fingerprint = _input_fingerprint(config, push_data, ado_mapping, source_files)
+    fingerprint_path = get_output_path(proj, _FINGERPRINT_FILE)
+    if not force and _read_fingerprint(fingerprint_path) == fingerprint:
+        click.secho("  ✓ RTM inputs unchanged since last publish — skipping", fg="green")
         return
 
-    # Upload source files as wiki attachments
-    attachment_links = _upload_attachments(config, wiki_id, source_files)
+    # Find or create wiki, preferring the one resolved on an earlier run
+    state_path = get_output_path(proj, _STATE_FILE)
+    wiki_id = _load_cached_wiki_id(state_path, config)
+    cached = wiki_id is not None
+    if not cached:
+        wiki_id = _find_or_create_wiki(config)
+        if not wiki_id:
+            click.secho("  ✗ Could not find or create a wiki", fg="red")
+            return
+        _save_cached_wiki_id(state_path, config, wiki_id)
 
-    # Render and publish
-    content = _generate_wiki_markdown(rtm_data, project_name, attachment_links)
-    _upsert_rtm_page(config, wiki_id, content)
+    try:
+        attachment_links = _publish(config, wiki_id, proj, project_name, rtm_data, source_files)
+    except Exception:
+        if not cached:
+            raise
+        # The cached wiki may be gone; resolve it again and retry once
+        click.echo("  Publishing to the cached wiki failed, looking it up again...")
+        state_path.unlink(missing_ok=True)
+        wiki_id = _find_or_create_wiki(config)
+        if not wiki_id:
+            click.secho("  ✗ Could not find or create a wiki", fg="red")
+            return
+        _save_cached_wiki_id(state_path, config, wiki_id)
+        attachment_links = _publish(config, wiki_id, proj, project_name, rtm_data, source_files)
     click.secho("  ✓ RTM wiki page published", fg="green")
 
+    # Only remember a complete page, so failed uploads are retried next run
+    if len(attachment_links) == len(source_files):
+        fingerprint_path.write_text(fingerprint, encoding="utf-8")
+
+
+def _publish(
+    config: ado_client.AdoConfig,
+    wiki_id: str,
+    proj: dict,
+    project_name: str,
+    rtm_data: dict,
+    source_files: dict[str, dict],
+) -> dict[str, str]:
+    """Upload attachments, then render and upsert the page. Returns the attachment links."""
+    attachment_links = _upload_attachments(
+        config, wiki_id, source_files, get_output_path(proj, _ATTACHMENTS_FILE),
+    )
+    content = _generate_wiki_markdown(rtm_data, project_name, attachment_links, source_files)
+    _upsert_rtm_page(config, wiki_id, content)
+    return attachment_links
+
+
+def _load_cached_wiki_id(path: Path, config: ado_client.AdoConfig) -> str | None:
+    """Return the wiki ID saved for this org/project, or None."""
+    try:
+        state = read_json(path)
+    except (FileNotFoundError, JSONDecodeError):
+        return None
+    if not isinstance(state, dict):
+        return None
+    if (state.get("organization"), state.get("project")) != (config.organization, config.project):
+        return None
+    return state.get("wiki_id") or None
+
+
+def _save_cached_wiki_id(path: Path, config: ado_client.AdoConfig, wiki_id: str) -> None:
+    """Remember the resolved wiki ID for later runs."""
+    write_json(path, {
+        "organization": config.organization,
+        "project": config.project,
+        "wiki_id": wiki_id,
+    })
+
+
+def _input_fingerprint(
+    config: ado_client.AdoConfig,
+    push_data: dict,
+    ado_mapping: dict,
+    source_files: dict[str, dict],
+) -> str:
+    """Hash everything the RTM page depends on.
+
+    Source files contribute name, size and mtime rather than content.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{config.organization}\0{config.project}\0".encode("utf-8"))
+    h.update(dumps(push_data, indent=False))
+    h.update(dumps(ado_mapping, indent=False))
+    for name, info in sorted(source_files.items()):
+        try:
+            st = os.stat(info["path"])
+        except OSError:
+            continue
+        h.update(f"\0{name}\0{st.st_size}\0{st.st_mtime_ns}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _read_fingerprint(path: Path) -> str | None:
+    """Return the stored fingerprint, or None if there is none."""
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
 
 # --- Data loading helpers ---
 
@@ -116,11 +228,10 @@ def _load_push_data(proj: dict) -> dict | None:
         path = get_output_path(proj, filename)
         if path.exists():
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = read_json(path)
                 if "epics" in data:
                     return data
-            except (json.JSONDecodeError, KeyError):
+            except (JSONDecodeError, KeyError):
                 pass
 
     click.secho("  ✗ No push_ready.json or breakdown.json found.", fg="red")
@@ -134,9 +245,8 @@ def _load_ado_mapping(proj: dict) -> dict | None:
         click.secho("  ✗ ado_mapping.json not found. Push stories first.", fg="red")
         return None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, KeyError):
+        return read_json(path)
+    except (JSONDecodeError, KeyError):
         click.secho("  ✗ Invalid ado_mapping.json", fg="red")
         return None
 
@@ -158,17 +268,38 @@ def _scan_source_files(proj: dict) -> dict[str, dict]:
     ]
     result: dict[str, dict] = {}
     for dir_path, category in dirs:
-        if not dir_path.exists():
-            continue
-        for fpath in sorted(dir_path.rglob("*")):
-            if not fpath.is_file():
-                continue
-            if fpath.name.startswith(".") or fpath.name.lower() in SKIP_FILES:
-                continue
-            result[fpath.name] = {"category": category, "path": str(fpath)}
+        # Sorted by path so a name found in several subfolders resolves
+        # the same way on every run (last one wins)
+        for path, name in sorted(_walk_files(str(dir_path))):
+            result[name] = {"category": category, "path": path}
     return result
 
 
+def _walk_files(root: str):
+    """Yield (path, name) for every source file under root, in one scandir walk.
+
+    Hidden files and SKIP_FILES are filtered by name before any type check.
+    DirEntry type checks reuse the readdir result, so most entries cost no
+    extra stat() call. A missing root yields nothing.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                name = entry.name
+                if name.startswith(".") or name.lower() in SKIP_FILES:
+                    continue
+                if entry.is_file():
+                    yield entry.path, name
+
+
 # --- RTM data builder (story-centric) ---
 
 def _build_rtm_data(
@@ -199,30 +330,25 @@ def _build_rtm_data(
     stories: list[dict] = []
     untraced: list[dict] = []
     referenced_files: set[str] = set()
-    file_story_counts: dict[str, int] = {}
-
-    for epic in push_data.get("epics", []):
-        for feature in epic.get("features", []):
-            for story in feature.get("stories", []):
-                local_id = story.get("id", "")
-                ado_id = id_to_ado.get(local_id)
-                title = story.get("title", "Unknown")
-                refs = story.get("reference_sources", [])
-
-                entry = {
-                    "id": local_id,
-                    "ado_id": ado_id,
-                    "title": title,
-                    "sources": refs,
-                }
-                stories.append(entry)
-
-                if not refs:
-                    untraced.append(entry)
-                else:
-                    for ref in refs:
-                        referenced_files.add(ref)
-                        file_story_counts[ref] = file_story_counts.get(ref, 0) + 1
+    file_story_counts: Counter[str] = Counter()
+
+    for story in _iter_stories(push_data):
+        local_id = story.get("id", "")
+        refs = story.get("reference_sources", [])
+
+        entry = {
+            "id": local_id,
+            "ado_id": id_to_ado.get(local_id),
+            "title": story.get("title", "Unknown"),
+            "sources": refs,
+        }
+        stories.append(entry)
+
+        if refs:
+            referenced_files.update(refs)
+            file_story_counts.update(refs)
+        else:
+            untraced.append(entry)
 
     # Unreferenced files
     unreferenced = []
@@ -241,35 +367,105 @@ def _build_rtm_data(
     }
 
 
+def _iter_stories(push_data: dict):
+    """Yield every story in push data, flattened across epics and features."""
+    return (
+        story
+        for epic in push_data.get("epics", ())
+        for feature in epic.get("features", ())
+        for story in feature.get("stories", ())
+    )
+
+
 # --- Wiki attachment upload ---
 
 def _upload_attachments(
     config: ado_client.AdoConfig,
     wiki_id: str,
     source_files: dict[str, dict],
+    cache_path: Path,
 ) -> dict[str, str]:
-    """Upload source files as wiki attachments. Returns {filename: wiki_path}."""
+    """Upload source files as wiki attachments. Returns {filename: wiki_path}.
+
+    Files whose content hash matches their last successful upload to the
+    same wiki are not sent again; their recorded wiki path is reused.
+    Uploads run concurrently; results are collected in filename order.
+    """
+    previous = _load_uploaded(cache_path, wiki_id)
+    uploaded: dict[str, dict] = {}
     links: dict[str, str] = {}
-    for filename, info in sorted(source_files.items()):
-        try:
-            wiki_path = ado_client.upload_wiki_attachment(
-                config, wiki_id, info["path"], filename,
-            )
-            links[filename] = wiki_path
-        except Exception as e:
-            click.secho(f"    ⚠ Failed to upload {filename}: {e}", fg="yellow")
-
-    if links:
-        click.echo(f"  Uploaded {len(links)} source files as wiki attachments")
+    sent = 0
+    files = sorted(source_files.items())
+    with ThreadPoolExecutor(max_workers=ado_client.MAX_WORKERS) as pool:
+        futures = [
+            pool.submit(_upload_if_changed, config, wiki_id, info["path"], filename,
+                        previous.get(filename))
+            for filename, info in files
+        ]
+        for (filename, _), future in zip(files, futures):
+            try:
+                record, was_sent = future.result()
+            except Exception as e:
+                click.secho(f"    ⚠ Failed to upload {filename}: {e}", fg="yellow")
+                continue
+            uploaded[filename] = record
+            links[filename] = record["path"]
+            sent += was_sent
+
+    if sent:
+        click.echo(f"  Uploaded {sent} source files as wiki attachments")
+    if len(links) > sent:
+        click.echo(f"  {len(links) - sent} attachments unchanged, not re-uploaded")
+    if uploaded != previous:
+        write_json(cache_path, {"wiki_id": wiki_id, "files": uploaded})
     return links
 
 
+def _upload_if_changed(
+    config: ado_client.AdoConfig,
+    wiki_id: str,
+    path: str,
+    filename: str,
+    previous: dict | None,
+) -> tuple[dict, bool]:
+    """Upload one attachment unless its hash matches the previous upload.
+
+    Returns ({"hash", "path"}, whether it was uploaded).
+    """
+    digest = _file_hash(path)
+    if previous and previous.get("hash") == digest:
+        return previous, False
+    wiki_path = ado_client.upload_wiki_attachment(config, wiki_id, path, filename)
+    return {"hash": digest, "path": wiki_path}, True
+
+
+def _file_hash(path: str) -> str:
+    """BLAKE2b of a file's content, read through mmap to avoid a copy."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.blake2b(b"", digest_size=16).hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return hashlib.blake2b(m, digest_size=16).hexdigest()
+
+
+def _load_uploaded(cache_path: Path, wiki_id: str) -> dict[str, dict]:
+    """Load {filename: {"hash", "path"}} recorded for this wiki, or {}."""
+    try:
+        data = read_json(cache_path)
+    except (FileNotFoundError, JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("wiki_id") != wiki_id:
+        return {}
+    return data.get("files", {})
+
+
 # --- Wiki markdown renderer ---
 
 def _generate_wiki_markdown(
     rtm_data: dict,
     project_name: str,
     attachment_links: dict[str, str],
+    source_files: dict[str, dict],
 ) -> str:
     """Render the RTM wiki page with source overview and story-centric matrix."""
     org = rtm_data["org"]
@@ -277,20 +473,23 @@ def _generate_wiki_markdown(
     total = rtm_data["total_stories"]
     traced = total - len(rtm_data["untraced_stories"])
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    url_prefix = f"https://dev.azure.com/{org}/{project}/_workitems/edit/"
 
-    lines = [
-        "# Requirements Traceability Matrix",
-        "",
-        f"**Project:** {project_name} | **Generated:** {now} | "
-        f"**Coverage:** {traced}/{total} stories traced",
-        "",
-        "---",
-        "",
-    ]
+    buf = io.StringIO()
+    w = buf.write
+
+    # Every section after the first opens with the blank line that
+    # separates it from the previous one
+    w("# Requirements Traceability Matrix\n"
+      "\n"
+      f"**Project:** {project_name} | **Generated:** {now} | "
+      f"**Coverage:** {traced}/{total} stories traced\n"
+      "\n"
+      "---\n"
+      "\n")
 
     # --- Section 1: Source Documents overview ---
-    lines.append("## Source Documents")
-    lines.append("")
+    w("## Source Documents\n\n")
 
     file_counts = rtm_data["file_story_counts"]
     unreferenced = rtm_data["unreferenced_files"]
@@ -298,90 +497,76 @@ def _generate_wiki_markdown(
     # Collect all files: referenced + unreferenced
     all_files: list[tuple[str, str, int]] = []  # (filename, category, story_count)
     for filename, count in sorted(file_counts.items()):
-        cat = "Input"
-        if filename.lower().startswith("cr_") or "change" in filename.lower():
-            cat = "Change Request"
+        info = source_files.get(filename)
+        if info:
+            cat = info["category"]
+        else:
+            # Referenced but not on disk: guess from the name
+            name_lower = filename.lower()
+            cat = "Change Request" if name_lower.startswith("cr_") or "change" in name_lower else "Input"
         all_files.append((filename, cat, count))
     for f in unreferenced:
         all_files.append((f["filename"], f["category"], 0))
 
-    lines.append("| # | Document | Type | Stories | Download |")
-    lines.append("|---|----------|------|---------|----------|")
+    w("| # | Document | Type | Stories | Download |\n"
+      "|---|----------|------|---------|----------|\n")
+    link_for = attachment_links.get
     for idx, (filename, category, count) in enumerate(all_files, 1):
         count_str = str(count) if count > 0 else "—"
-        if filename in attachment_links:
-            download = f"[Download]({attachment_links[filename]})"
-        else:
-            download = "—"
-        lines.append(f"| {idx} | {filename} | {category} | {count_str} | {download} |")
-    lines.append("")
+        link = link_for(filename)
+        download = f"[Download]({link})" if link else "—"
+        w(f"| {idx} | {filename} | {category} | {count_str} | {download} |\n")
 
     # --- Section 2: Story-centric traceability matrix ---
-    lines.append("---")
-    lines.append("")
-    lines.append("## Traceability Matrix")
-    lines.append("")
+    w("\n---\n\n## Traceability Matrix\n\n")
 
     stories = rtm_data["stories"]
-    lines.append("| Story ID | Story Title | Source Documents |")
-    lines.append("|----------|-------------|-----------------|")
-    for s in stories:
-        if s["ado_id"]:
-            url = (
-                f"https://dev.azure.com/{org}/{project}"
-                f"/_workitems/edit/{s['ado_id']}"
-            )
-            title_cell = f"[{s['title']}]({url})"
-        else:
-            title_cell = s["title"]
-
-        if s["sources"]:
-            numbered = [f"{i}. {src}" for i, src in enumerate(s["sources"], 1)]
-            sources_cell = "<br>".join(numbered)
-        else:
-            sources_cell = "⚠️ *Untraced*"
-
-        lines.append(f"| {s['id']} | {title_cell} | {sources_cell} |")
-    lines.append("")
+    w("| Story ID | Story Title | Source Documents |\n"
+      "|----------|-------------|-----------------|\n")
+    w("".join(f"| {s['id']} | {_story_title_cell(s, url_prefix)} | {_sources_cell(s)} |\n"
+              for s in stories))
 
     # --- Section 3: Coverage gaps (only if there are any) ---
     untraced = rtm_data["untraced_stories"]
     if untraced or unreferenced:
-        lines.append("---")
-        lines.append("")
-        lines.append("## Coverage Gaps")
-        lines.append("")
+        w("\n---\n\n## Coverage Gaps\n")
 
     if untraced:
-        lines.append(f"### Untraced Stories ({len(untraced)})")
-        lines.append("")
-        lines.append("Stories with no reference sources — traceability unknown.")
-        lines.append("")
-        lines.append("| ID | Title | ADO Link |")
-        lines.append("|----|-------|----------|")
+        w(f"\n### Untraced Stories ({len(untraced)})\n"
+          "\n"
+          "Stories with no reference sources — traceability unknown.\n"
+          "\n"
+          "| ID | Title | ADO Link |\n"
+          "|----|-------|----------|\n")
         for s in untraced:
-            if s["ado_id"]:
-                url = (
-                    f"https://dev.azure.com/{org}/{project}"
-                    f"/_workitems/edit/{s['ado_id']}"
-                )
-                lines.append(f"| {s['id']} | {s['title']} | [#{s['ado_id']}]({url}) |")
-            else:
-                lines.append(f"| {s['id']} | {s['title']} | — |")
-        lines.append("")
+            aid = s["ado_id"]
+            link_cell = f"[#{aid}]({url_prefix}{aid})" if aid else "—"
+            w(f"| {s['id']} | {s['title']} | {link_cell} |\n")
 
     if unreferenced:
-        lines.append(f"### Unreferenced Documents ({len(unreferenced)})")
-        lines.append("")
-        lines.append("Source files not referenced by any story.")
-        lines.append("")
-        lines.append("| Filename | Type |")
-        lines.append("|----------|------|")
-        for f in unreferenced:
-            lines.append(f"| {f['filename']} | {f['category']} |")
-        lines.append("")
-
-    return "\n".join(lines)
+        w(f"\n### Unreferenced Documents ({len(unreferenced)})\n"
+          "\n"
+          "Source files not referenced by any story.\n"
+          "\n"
+          "| Filename | Type |\n"
+          "|----------|------|\n")
+        w("".join(f"| {f['filename']} | {f['category']} |\n" for f in unreferenced))
+
+    return buf.getvalue()
+
+
+def _story_title_cell(s: dict, url_prefix: str) -> str:
+    """Story title, linked to its ADO work item when it has been pushed."""
+    aid = s["ado_id"]
+    title = s["title"]
+    return f"[{title}]({url_prefix}{aid})" if aid else title
+
+
+def _sources_cell(s: dict) -> str:
+    """Numbered list of a story's source documents, or an untraced marker."""
+    if s["sources"]:
+        return "<br>".join(f"{i}. {src}" for i, src in enumerate(s["sources"], 1))
+    return "⚠️ *Untraced*"
 
 
 # --- Wiki helpers ---
@@ -6,12 +6,14 @@ Looks up [FE] and [BE] child tasks of each story.
 Uploads each spec as an attachment to the matching task.
 """
 
-import json
+import re
 import click
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from core.config import get_output_path, get_specs_dir
 from core import ado as ado_client
+from core.jsonio import JSONDecodeError, read_json
 from core.usage import log_operation
 
 
@@ -55,37 +57,44 @@ def run(proj: dict) -> None:
 
     click.echo(f"  Found {len(fe_specs)} FE specs, {len(be_specs)} BE specs")
 
-    # Build a lookup of story title/id → ADO story ID
+    # Build a lookup of story title/id → ADO story ID (first story wins on
+    # duplicate titles; empty keys would match every filename)
     story_lookup = {}
     for story in mapping.get("stories", []):
         ado_id = story.get("ado_id")
-        title = story.get("title", "")
-        sid = story.get("id", "")
-        if ado_id:
-            story_lookup[title.lower()] = ado_id
-            story_lookup[sid.lower()] = ado_id
-
-    # Cache for child tasks: story_ado_id → {prefix → task_ado_id}
-    task_cache = {}
-
-    uploaded = 0
-    errors = 0
-
-    # Upload FE specs
-    for spec_path in sorted(fe_specs):
-        ok = _upload_spec(config, spec_path, "FE", story_lookup, task_cache)
-        if ok:
-            uploaded += 1
-        else:
-            errors += 1
-
-    # Upload BE specs
-    for spec_path in sorted(be_specs):
-        ok = _upload_spec(config, spec_path, "BE", story_lookup, task_cache)
-        if ok:
-            uploaded += 1
-        else:
-            errors += 1
+        if not ado_id:
+            continue
+        title = story.get("title", "").lower()
+        sid = story.get("id", "").lower()
+        if title:
+            story_lookup.setdefault(title, ado_id)
+        if sid:
+            story_lookup.setdefault(sid, ado_id)
+
+    story_pattern = _compile_story_pattern(story_lookup)
+
+    # (spec_path, prefix, story_ado_id) — each spec is matched exactly once
+    jobs = [
+        (p, prefix, _match_spec_to_story(_normalize_spec_name(p.stem), story_pattern, story_lookup))
+        for prefix, specs in (("FE", fe_specs), ("BE", be_specs))
+        for p in sorted(specs)
+    ]
+    story_ids = {sid for _, _, sid in jobs if sid}
+
+    # One pool for both stages: every matched story's child tasks are fetched
+    # first, and each upload waits only on its own story's fetch rather than
+    # on all of them. The fetches are queued ahead of the uploads, so an
+    # upload never occupies a worker its fetch still needs.
+    with ThreadPoolExecutor(max_workers=ado_client.MAX_WORKERS) as pool:
+        # story_ado_id → Future of {prefix → task_ado_id}
+        task_cache = {sid: pool.submit(_fetch_tasks, config, sid) for sid in story_ids}
+        futures = [
+            pool.submit(_upload_spec, config, spec_path, prefix, story_ado_id, task_cache)
+            for spec_path, prefix, story_ado_id in jobs
+        ]
+        results = [f.result() for f in futures]
+    uploaded = sum(results)
+    errors = len(results) - uploaded
 
     # Log usage
     stats = ado_client.get_call_stats()
@@ -105,16 +114,13 @@ def run(proj: dict) -> None:
         click.secho(f"    Errors: {errors}", fg="yellow")
 
 
-def _upload_spec(config, spec_path: Path, prefix: str,
-                  story_lookup: dict, task_cache: dict) -> bool:
+def _upload_spec(config, spec_path: Path, prefix: str, story_ado_id: int | None,
+                  task_cache: dict) -> bool:
     """Upload a single spec file to the matching ADO task.
 
+    story_ado_id is the story the spec filename matched, or None.
     Returns True on success, False on failure.
     """
-    filename = spec_path.stem  # e.g. "US-001_Login_Page"
-
-    # Try to match spec filename to a story
-    story_ado_id = _match_spec_to_story(filename, story_lookup)
     if not story_ado_id:
         click.secho(f"  ⚠ [{prefix}] No ADO story match for {spec_path.name}", fg="yellow")
         return False
@@ -139,44 +145,65 @@ def _upload_spec(config, spec_path: Path, prefix: str,
         return False
 
 
-def _match_spec_to_story(filename: str, story_lookup: dict) -> int | None:
-    """Try to match a spec filename to a story ADO ID.
+def _compile_story_pattern(story_lookup: dict) -> re.Pattern | None:
+    """Compile the lookup keys into one alternation, longest key first.
 
-    Spec filenames are expected to contain the story ID (e.g. "US-001")
-    or the story title (e.g. "Login_Page").
+    Ordering by length makes the most specific key win when several
+    match at the same position.
     """
-    name_lower = filename.lower().replace("_", " ").replace("-", " ")
+    keys = sorted(story_lookup, key=len, reverse=True)
+    if not keys:
+        return None
+    return re.compile("|".join(re.escape(k) for k in keys))
+
 
-    # Try exact key match on parts of the filename
-    for key, ado_id in story_lookup.items():
-        if key in name_lower:
-            return ado_id
+def _normalize_spec_name(filename: str) -> str:
+    """Lower-case a spec filename and turn "_" and "-" into spaces."""
+    return filename.lower().replace("_", " ").replace("-", " ")
 
-    return None
+
+def _match_spec_to_story(name_lower: str, story_pattern: re.Pattern | None,
+                         story_lookup: dict) -> int | None:
+    """Try to match a normalized spec filename to a story ADO ID.
+
+    Spec filenames are expected to contain the story ID (e.g. "US-001")
+    or the story title (e.g. "Login_Page"); see _normalize_spec_name.
+    """
+    if story_pattern is None:
+        return None
+    match = story_pattern.search(name_lower)
+    return story_lookup[match.group(0)] if match else None
 
 
 def _find_task(config, story_ado_id: int, prefix: str, cache: dict) -> int | None:
-    """Find the [FE] or [BE] task under a story, with caching."""
-    cache_key = story_ado_id
-    if cache_key not in cache:
-        try:
-            children = ado_client.get_child_work_items(config, story_ado_id)
-            tasks = {}
-            for child in children:
-                fields = child.get("fields", {})
-                title = fields.get("System.Title", "")
-                cid = child.get("id")
-                if title.startswith("[FE]"):
-                    tasks["FE"] = cid
-                elif title.startswith("[BE]"):
-                    tasks["BE"] = cid
-                elif title.startswith("[DevOps]"):
-                    tasks["DevOps"] = cid
-            cache[cache_key] = tasks
-        except Exception:
-            cache[cache_key] = {}
-
-    return cache.get(cache_key, {}).get(prefix)
+    """Find the [FE] or [BE] task under a story.
+
+    cache maps story ADO IDs to in-flight fetches (Futures); a story that
+    was not prefetched is fetched directly.
+    """
+    future = cache.get(story_ado_id)
+    tasks = future.result() if future else _fetch_tasks(config, story_ado_id)
+    return tasks.get(prefix)
+
+
+def _fetch_tasks(config, story_ado_id: int) -> dict[str, int]:
+    """Fetch a story's discipline tasks as {prefix → task_ado_id} ({} on error)."""
+    try:
+        children = ado_client.get_child_work_items(config, story_ado_id, fields=["System.Title"])
+    except Exception:
+        return {}
+    tasks = {}
+    for child in children:
+        fields = child.get("fields", {})
+        title = fields.get("System.Title", "")
+        cid = child.get("id")
+        if title.startswith("[FE]"):
+            tasks["FE"] = cid
+        elif title.startswith("[BE]"):
+            tasks["BE"] = cid
+        elif title.startswith("[DevOps]"):
+            tasks["DevOps"] = cid
+    return tasks
 
 
 def _load_mapping(proj: dict) -> dict | None:
@@ -187,8 +214,7 @@ def _load_mapping(proj: dict) -> dict | None:
         click.echo("    Run: xproject push first to create the ADO mapping.")
         return None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        return read_json(path)
+    except JSONDecodeError as e:
         click.secho(f"  ✗ Failed to parse ado_mapping.json: {e}", fg="red")
         return None
@@ -1,23 +1,69 @@
 """Azure DevOps REST API client for work item management."""
 
-import json
 import logging
+import os
 import time
 import base64
+import email.utils
+import gzip
+import select
+import ssl
+import threading
+import weakref
+import zlib
+import http.client
 import urllib.parse
-import urllib.request
-import urllib.error
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cached_property
+
+from core import jsonio
 
 logger = logging.getLogger(__name__)
 
 
 ADO_API_VERSION = "7.1"
-RATE_LIMIT_DELAY = 0.3  # seconds between API calls to avoid throttling
+RATE_LIMIT_PER_SECOND = 10.0  # sustained API calls per second, across all threads
+RATE_LIMIT_BURST = 10  # calls allowed back to back after an idle spell
+HTTP_TIMEOUT = 60  # socket timeout in seconds for a single request
+MAX_WORKERS = 8  # concurrent requests for bulk operations
+GET_CACHE_SIZE = 1024  # GET responses kept for reuse by _api_request
+GET_CACHE_TTL = 30.0  # seconds a cached GET response stays fresh
+METADATA_TTL = 300.0  # seconds project and repository lookups are reused
+
+# Keep-alive HTTPS connections, one per host per thread. Reusing the socket
+# skips the TCP + TLS handshake that otherwise dominates every ADO call.
+_local = threading.local()
+# Every pooled connection, so close_connections() also reaches worker threads'
+_all_conns: "weakref.WeakSet[http.client.HTTPSConnection]" = weakref.WeakSet()
+_conns_lock = threading.Lock()
+# One TLS context shared by all pooled connections; building a context loads
+# the system CA bundle, which is too slow to repeat for every worker thread
+_ssl_context: ssl.SSLContext | None = None
+
+# Recent GET response bodies, least recently used first. Any write
+# clears it and bumps the generation, so a GET that was in flight
+# during the write cannot store a stale body afterwards.
+_get_cache: "OrderedDict[tuple, tuple[float, bytes]]" = OrderedDict()
+_get_cache_generation = 0
+_get_cache_lock = threading.Lock()
+# Slow-changing project metadata (see _cached_metadata). Unlike the GET
+# cache it survives unrelated writes.
+_metadata_cache: dict[tuple, tuple[float, object]] = {}
+_metadata_lock = threading.Lock()
+# POST endpoints that only read, so they leave the GET cache alone
+_READ_ONLY_POSTS = ("/_apis/wit/wiql", "/_apis/wit/workitemsbatch")
+
+# In-flight request coalescing (see _single_flight)
+_inflight: dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
 
 # Module-level API call counter for usage tracking
 _call_count = 0
 _call_total_seconds = 0.0
+_stats_lock = threading.Lock()
 
 
 def reset_call_counter() -> None:
@@ -27,24 +73,68 @@ def reset_call_counter() -> None:
     _call_total_seconds = 0.0
 
 
+def reset_cache() -> None:
+    """Forget all cached GET responses and project metadata."""
+    _clear_get_cache()
+    with _metadata_lock:
+        _metadata_cache.clear()
+
+
+def _clear_get_cache() -> None:
+    """Forget cached GET responses; called after every write."""
+    global _get_cache_generation
+    with _get_cache_lock:
+        _get_cache.clear()
+        _get_cache_generation += 1
+
+
 def get_call_stats() -> dict:
     """Return current API call count and total elapsed seconds."""
     return {"count": _call_count, "total_seconds": round(_call_total_seconds, 2)}
 
 
-@dataclass
+def close_connections() -> None:
+    """Close all pooled keep-alive connections, including worker threads'.
+
+    Call once no requests are in flight, e.g. at the end of a command.
+    A thread that makes another call afterwards simply reconnects.
+    """
+    with _conns_lock:
+        conns = list(_all_conns)
+        _all_conns.clear()
+    for conn in conns:
+        conn.close()
+    getattr(_local, "conns", {}).clear()
+
+
+@dataclass(frozen=True)
 class AdoConfig:
-    """ADO connection configuration."""
+    """ADO connection configuration.
+
+    Frozen so the derived URL and auth header can be computed once.
+    """
     organization: str
     project: str
     pat: str
 
-    @property
+    @cached_property
+    def org_url(self) -> str:
+        return f"https://dev.azure.com/{self.organization}"
+
+    @cached_property
+    def project_path(self) -> str:
+        """The project name, URL-encoded for use as a path segment."""
+        return urllib.parse.quote(self.project, safe="")
+
+    @cached_property
+    def project_url(self) -> str:
+        return f"{self.org_url}/{self.project_path}"
+
+    @cached_property
     def base_url(self) -> str:
-        proj = urllib.parse.quote(self.project, safe="")
-        return f"https://dev.azure.com/{self.organization}/{proj}/_apis"
+        return f"{self.project_url}/_apis"
 
-    @property
+    @cached_property
     def auth_header(self) -> str:
         token = base64.b64encode(f":{self.pat}".encode()).decode()
         return f"Basic {token}"
@@ -90,8 +180,116 @@ def create_work_item(
     """
     wit_encoded = urllib.parse.quote(work_item_type, safe="")
     url = f"{config.base_url}/wit/workitems/${wit_encoded}?api-version={ADO_API_VERSION}"
+    patches = _work_item_patches(config, title, description, tags, parent_id, extra_fields)
+    return _api_request(config, url, method="POST", body=patches,
+                        content_type="application/json-patch+json")
+
+
+def create_work_items_batch(config: AdoConfig, items: list[dict]) -> list[dict]:
+    """
+    Create several work items through the ADO $batch endpoint.
+
+    Up to 200 creates go in one HTTP call. Unlike a JSON-Patch document the
+    batch is not atomic: each entry succeeds or fails on its own.
+
+    Args:
+        config: ADO connection config
+        items: One dict per work item with create_work_item's keyword
+            arguments ("work_item_type" and "title" required)
 
-    # Build patch document
+    Returns:
+        One entry per input item, in order: the created work item dict, or
+        {"error": message, "status": code} if that item failed
+    """
+    requests = []
+    for item in items:
+        wit_encoded = urllib.parse.quote(item["work_item_type"], safe="")
+        requests.append((
+            f"/{config.project_path}/_apis/wit/workitems/${wit_encoded}?api-version={ADO_API_VERSION}",
+            _work_item_patches(
+                config, item["title"], item.get("description", ""),
+                item.get("tags", ""), item.get("parent_id"), item.get("extra_fields"),
+            ),
+        ))
+    return _post_batch(config, requests)
+
+
+def update_work_items_batch(config: AdoConfig, items: list[dict]) -> list[dict]:
+    """
+    Update several work items through the ADO $batch endpoint.
+
+    Up to 200 updates go in one HTTP call. Each item's patch is applied
+    atomically, but items succeed or fail independently of each other.
+
+    Args:
+        config: ADO connection config
+        items: One dict per work item: "id" plus "fields" (field path → value,
+            as for update_work_item) and/or "links" ((target_id, link_type,
+            comment) tuples, as for add_links_bulk)
+
+    Returns:
+        One entry per input item, in order: the updated work item dict, or
+        {"error": message, "status": code} if that item failed
+    """
+    requests = []
+    for item in items:
+        patches = _field_patches(item.get("fields") or {})
+        patches += _link_patches(config, list(dict.fromkeys(item.get("links") or ())))
+        requests.append((
+            f"/_apis/wit/workitems/{item['id']}?api-version={ADO_API_VERSION}",
+            patches,
+        ))
+    return _post_batch(config, requests)
+
+
+def _post_batch(config: AdoConfig, requests: list[tuple[str, list[dict]]]) -> list[dict]:
+    """Send (uri, JSON-Patch) PATCH sub-requests through $batch, 200 per call.
+
+    Returns one entry per sub-request, in order: the response body, or
+    {"error": message, "status": code} if it failed.
+    """
+    url = f"{config.org_url}/_apis/wit/$batch?api-version={ADO_API_VERSION}"
+
+    results = []
+    for i in range(0, len(requests), 200):
+        batch = [
+            {
+                "method": "PATCH",
+                "uri": uri,
+                "headers": {"Content-Type": "application/json-patch+json"},
+                "body": patches,
+            }
+            for uri, patches in requests[i:i + 200]
+        ]
+        response = _api_request(config, url, method="POST", body=batch)
+        entries = response.get("value") or []
+        for entry in entries[:len(batch)]:
+            code = entry.get("code", 0)
+            try:
+                body = jsonio.loads(entry.get("body") or "{}")
+            except jsonio.JSONDecodeError:
+                body = {"message": entry.get("body", "")}
+            if 200 <= code < 300:
+                results.append(body)
+            else:
+                results.append({"error": body.get("message", "Unknown error"), "status": code})
+        # A short response must not silently drop the trailing sub-requests
+        results.extend(
+            {"error": "missing from $batch response", "status": 0}
+            for _ in range(len(batch) - len(entries))
+        )
+    return results
+
+
+def _work_item_patches(
+    config: AdoConfig,
+    title: str,
+    description: str = "",
+    tags: str = "",
+    parent_id: int | None = None,
+    extra_fields: dict | None = None,
+) -> list[dict]:
+    """Build the JSON-Patch document that creates a work item."""
     patches = [
         {"op": "add", "path": "/fields/System.Title", "value": title},
     ]
@@ -116,7 +314,7 @@ def create_work_item(
             "path": "/relations/-",
             "value": {
                 "rel": "System.LinkTypes.Hierarchy-Reverse",
-                "url": f"https://dev.azure.com/{config.organization}/_apis/wit/workItems/{parent_id}",
+                "url": f"{config.org_url}/_apis/wit/workItems/{parent_id}",
             },
         })
 
@@ -126,8 +324,7 @@ def create_work_item(
                 field_path = f"/fields/{field_path}"
             patches.append({"op": "add", "path": field_path, "value": value})
 
-    return _api_request(config, url, method="POST", body=patches,
-                        content_type="application/json-patch+json")
+    return patches
 
 
 def update_work_item(
@@ -147,15 +344,18 @@ def update_work_item(
         Updated work item dict
     """
     url = f"{config.base_url}/wit/workitems/{work_item_id}?api-version={ADO_API_VERSION}"
+    return _api_request(config, url, method="PATCH", body=_field_patches(fields),
+                        content_type="application/json-patch+json")
 
+
+def _field_patches(fields: dict) -> list[dict]:
+    """Build JSON-Patch ops that set field path → value pairs."""
     patches = []
     for field_path, value in fields.items():
         if not field_path.startswith("/fields/"):
             field_path = f"/fields/{field_path}"
         patches.append({"op": "add", "path": field_path, "value": value})
-
-    return _api_request(config, url, method="PATCH", body=patches,
-                        content_type="application/json-patch+json")
+    return patches
 
 
 def add_link(
@@ -178,33 +378,67 @@ def add_link(
             - "System.LinkTypes.Related" (Related)
         comment: Optional comment describing the relationship
 
+    Returns:
+        Updated work item dict
+    """
+    return add_links_bulk(config, source_id, [(target_id, link_type, comment)])
+
+
+def add_links_bulk(
+    config: AdoConfig,
+    source_id: int,
+    links: list[tuple[int, str, str]],
+) -> dict:
+    """
+    Add several relation links to one work item in a single PATCH.
+
+    The JSON-Patch document is applied atomically: if any link is rejected
+    (e.g. it already exists), none of them are added.
+
+    Args:
+        config: ADO connection config
+        source_id: ID of the work item to add the links to
+        links: (target_id, link_type, comment) tuples; see add_link
+
     Returns:
         Updated work item dict
     """
     url = f"{config.base_url}/wit/workitems/{source_id}?api-version={ADO_API_VERSION}"
 
-    link_value = {
-        "rel": link_type,
-        "url": f"https://dev.azure.com/{config.organization}/_apis/wit/workItems/{target_id}",
-    }
-    if comment:
-        link_value["attributes"] = {"comment": comment}
+    # Drop repeats (a target listed twice would make ADO reject the whole patch)
+    links = list(dict.fromkeys(links))
 
-    patches = [
-        {"op": "add", "path": "/relations/-", "value": link_value},
-    ]
+    patches = _link_patches(config, links)
 
-    return _api_request(config, url, method="PATCH", body=patches,
-                        content_type="application/json-patch+json")
+    # Identical concurrent link requests share a single PATCH
+    key = ("links", config.organization, source_id, tuple(links))
+    return _single_flight(key, _api_request, config, url, method="PATCH", body=patches,
+                          content_type="application/json-patch+json")
+
+
+def _link_patches(config: AdoConfig, links: list[tuple[int, str, str]]) -> list[dict]:
+    """Build JSON-Patch ops that add (target_id, link_type, comment) relations."""
+    patches = []
+    for target_id, link_type, comment in links:
+        link_value = {
+            "rel": link_type,
+            "url": f"{config.org_url}/_apis/wit/workItems/{target_id}",
+        }
+        if comment:
+            link_value["attributes"] = {"comment": comment}
+        patches.append({"op": "add", "path": "/relations/-", "value": link_value})
+    return patches
 
 
-def get_work_items_by_query(config: AdoConfig, wiql: str) -> list[dict]:
+def get_work_items_by_query(config: AdoConfig, wiql: str,
+                            fields: list[str] | None = None) -> list[dict]:
     """
     Query work items using WIQL (Work Item Query Language).
 
     Args:
         config: ADO connection config
         wiql: WIQL query string
+        fields: If given, fetch only these fields (no relations) via workitemsbatch
 
     Returns:
         List of work item dicts with full details
@@ -216,20 +450,49 @@ def get_work_items_by_query(config: AdoConfig, wiql: str) -> list[dict]:
     if not work_items:
         return []
 
-    # Fetch full details in batches of 200
     ids = [wi["id"] for wi in work_items]
-    detailed = []
-    for i in range(0, len(ids), 200):
-        batch = ids[i:i + 200]
-        id_str = ",".join(str(x) for x in batch)
-        detail_url = (
-            f"{config.base_url}/wit/workitems?ids={id_str}"
-            f"&$expand=relations&api-version={ADO_API_VERSION}"
-        )
-        batch_result = _api_request(config, detail_url, method="GET")
-        detailed.extend(batch_result.get("value", []))
+    if fields:
+        return get_work_items_batch(config, ids, fields)
+
+    return _get_work_items_full(config, ids, expand="relations")
+
+
+def _get_work_items_full(config: AdoConfig, ids: list[int],
+                         expand: str | None = None) -> list[dict]:
+    """GET all fields of many work items, 200 IDs per request, concurrently.
+
+    Results keep the order of ids.
+    """
+    url_prefix = f"{config.base_url}/wit/workitems?ids="
+    url_suffix = (f"&$expand={expand}" if expand else "") + f"&api-version={ADO_API_VERSION}"
+
+    def fetch(batch: list[int]) -> list[dict]:
+        detail_url = url_prefix + ",".join(map(str, batch)) + url_suffix
+        return _api_request(config, detail_url, method="GET").get("value", [])
+
+    batches = [ids[i:i + 200] for i in range(0, len(ids), 200)]
+    return [item for chunk in _map_concurrent(fetch, batches) for item in chunk]
+
+
+def get_work_items_batch(config: AdoConfig, ids: list[int],
+                         fields: list[str]) -> list[dict]:
+    """
+    Fetch selected fields for many work items via the workitemsbatch endpoint.
+
+    Sends one POST per 200 IDs (the API maximum), concurrently. IDs that no
+    longer exist are skipped rather than failing the whole batch.
 
-    return detailed
+    Returns:
+        List of work item dicts ({"id", "fields", ...}) in ID order
+    """
+    url = f"{config.base_url}/wit/workitemsbatch?api-version={ADO_API_VERSION}"
+
+    def fetch(batch: list[int]) -> list[dict]:
+        body = {"ids": batch, "fields": fields, "errorPolicy": "omit"}
+        return _api_request(config, url, method="POST", body=body).get("value", [])
+
+    batches = [ids[i:i + 200] for i in range(0, len(ids), 200)]
+    return [item for chunk in _map_concurrent(fetch, batches) for item in chunk if item]
 
 
 def get_all_stories(config: AdoConfig, tag_filter: str | None = None) -> list[dict]:
@@ -294,8 +557,8 @@ def test_connection(config: AdoConfig) -> bool:
     """Test ADO connection by fetching project info."""
     try:
         url = (
-            f"https://dev.azure.com/{config.organization}/_apis/projects/"
-            f"{urllib.parse.quote(config.project, safe='')}?api-version={ADO_API_VERSION}"
+            f"{config.org_url}/_apis/projects/{config.project_path}"
+            f"?api-version={ADO_API_VERSION}"
         )
         result = _api_request(config, url, method="GET")
         return "id" in result
@@ -338,21 +601,12 @@ def upload_attachment(
     # Step 1: Upload the file blob
     encoded_name = urllib.parse.quote(filename, safe="")
     upload_url = (
-        f"https://dev.azure.com/{config.organization}/{urllib.parse.quote(config.project, safe='')}/"
+        f"{config.project_url}/"
         f"_apis/wit/attachments?fileName={encoded_name}&api-version={ADO_API_VERSION}"
     )
 
-    file_data = fp.read_bytes()
-    headers = {
-        "Authorization": config.auth_header,
-        "Content-Type": "application/octet-stream",
-    }
-    req = urllib.request.Request(upload_url, data=file_data, headers=headers, method="POST")
-
-    time.sleep(RATE_LIMIT_DELAY)
-    with urllib.request.urlopen(req) as resp:
-        upload_result = json.loads(resp.read().decode("utf-8"))
-
+    upload_result = _api_request(config, upload_url, method="POST", data=_FileBody(fp),
+                                 content_type="application/octet-stream")
     attachment_url = upload_result.get("url", "")
 
     # Step 2: Link the attachment to the work item
@@ -387,21 +641,12 @@ def upload_file_blob(config: AdoConfig, file_path: str, filename: str | None = N
 
     encoded_name = urllib.parse.quote(filename, safe="")
     upload_url = (
-        f"https://dev.azure.com/{config.organization}/{urllib.parse.quote(config.project, safe='')}/"
+        f"{config.project_url}/"
         f"_apis/wit/attachments?fileName={encoded_name}&api-version={ADO_API_VERSION}"
     )
 
-    file_data = fp.read_bytes()
-    headers = {
-        "Authorization": config.auth_header,
-        "Content-Type": "application/octet-stream",
-    }
-    req = urllib.request.Request(upload_url, data=file_data, headers=headers, method="POST")
-
-    time.sleep(RATE_LIMIT_DELAY)
-    with urllib.request.urlopen(req) as resp:
-        upload_result = json.loads(resp.read().decode("utf-8"))
-
+    upload_result = _api_request(config, upload_url, method="POST", data=_FileBody(fp),
+                                 content_type="application/octet-stream")
     return upload_result.get("url", "")
 
 
@@ -428,29 +673,38 @@ def ensure_repository(config: AdoConfig, repo_name: str) -> dict:
     Checks if a repo with the given name already exists. If not, creates it.
     Returns the repo metadata dict (with 'id', 'name', 'remoteUrl', etc.).
     """
-    proj = urllib.parse.quote(config.project, safe="")
-
-    # List existing repos
-    list_url = (
-        f"https://dev.azure.com/{config.organization}/{proj}"
+    repos_url = (
+        f"{config.project_url}"
         f"/_apis/git/repositories?api-version={ADO_API_VERSION}"
     )
-    result = _api_request(config, list_url, method="GET")
-    for repo in result.get("value", []):
-        if repo.get("name", "").lower() == repo_name.lower():
-            return repo
+
+    # Existing repos by lower-cased name, listed once per METADATA_TTL
+    def list_repos() -> dict[str, dict]:
+        result = _api_request(config, repos_url, method="GET")
+        by_name: dict[str, dict] = {}
+        for repo in result.get("value", []):
+            by_name.setdefault(repo.get("name", "").lower(), repo)
+        return by_name
+
+    key = ("repos", config.organization, config.project, config.auth_header)
+    repos = _cached_metadata(key, list_repos)
+    repo = repos.get(repo_name.lower())
+    if repo is not None:
+        return dict(repo)
 
     # Create new repo
-    create_url = (
-        f"https://dev.azure.com/{config.organization}/{proj}"
-        f"/_apis/git/repositories?api-version={ADO_API_VERSION}"
-    )
-    body = {"name": repo_name}
-    return _api_request(config, create_url, method="POST", body=body)
+    repo = _api_request(config, repos_url, method="POST", body={"name": repo_name})
+    with _metadata_lock:
+        repos[repo_name.lower()] = repo
+    return dict(repo)
 
 
-def get_child_work_items(config: AdoConfig, parent_id: int) -> list[dict]:
-    """Get child work items (tasks) of a parent work item."""
+def get_child_work_items(config: AdoConfig, parent_id: int,
+                         fields: list[str] | None = None) -> list[dict]:
+    """Get child work items (tasks) of a parent work item.
+
+    If fields is given, only those fields are fetched, via workitemsbatch.
+    """
     wiql = (
         f"SELECT [System.Id], [System.Title], [System.WorkItemType] "
         f"FROM WorkItemLinks "
@@ -471,15 +725,9 @@ def get_child_work_items(config: AdoConfig, parent_id: int) -> list[dict]:
 
     if not child_ids:
         return []
-
-    # Fetch details
-    id_str = ",".join(str(x) for x in child_ids)
-    detail_url = (
-        f"{config.base_url}/wit/workitems?ids={id_str}"
-        f"&api-version={ADO_API_VERSION}"
-    )
-    batch_result = _api_request(config, detail_url, method="GET")
-    return batch_result.get("value", [])
+    if fields:
+        return get_work_items_batch(config, child_ids, fields)
+    return _get_work_items_full(config, child_ids)
 
 
 def get_work_item(
@@ -576,9 +824,8 @@ def get_wiki_list(config: AdoConfig) -> list[dict]:
     Returns:
         List of wiki dicts with id, name, type, etc.
     """
-    proj = urllib.parse.quote(config.project, safe="")
     url = (
-        f"https://dev.azure.com/{config.organization}/{proj}"
+        f"{config.project_url}"
         f"/_apis/wiki/wikis?api-version={ADO_API_VERSION}"
     )
     result = _api_request(config, url, method="GET")
@@ -601,11 +848,10 @@ def get_wiki_page(
     Returns:
         {"content": str, "etag": str} or {"error": str} if not found
     """
-    proj = urllib.parse.quote(config.project, safe="")
     encoded_wiki = urllib.parse.quote(wiki_id, safe="")
     encoded_path = urllib.parse.quote(path, safe="/")
     url = (
-        f"https://dev.azure.com/{config.organization}/{proj}"
+        f"{config.project_url}"
         f"/_apis/wiki/wikis/{encoded_wiki}/pages?path={encoded_path}"
         f"&includeContent=true&api-version={ADO_API_VERSION}"
     )
@@ -614,25 +860,17 @@ def get_wiki_page(
         "Authorization": config.auth_header,
         "Content-Type": "application/json",
     }
-    req = urllib.request.Request(url, headers=headers, method="GET")
 
-    try:
-        time.sleep(RATE_LIMIT_DELAY)
-        with urllib.request.urlopen(req) as resp:
-            etag = resp.headers.get("ETag", "")
-            body = json.loads(resp.read().decode("utf-8"))
-            return {"content": body.get("content", ""), "etag": etag}
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            return {"error": "Page not found", "status": 404}
-        body_text = ""
-        try:
-            body_text = e.read().decode("utf-8")
-        except Exception:
-            pass
+    status, reason, resp_headers, resp_body = _request(url, method="GET", headers=headers)
+    if status == 404:
+        return {"error": "Page not found", "status": 404}
+    if status >= 400:
+        body_text = resp_body.decode("utf-8", errors="replace")
         raise RuntimeError(
-            f"Wiki page GET error {e.code}: {e.reason}\nResponse: {body_text[:500]}"
+            f"Wiki page GET error {status}: {reason}\nResponse: {body_text[:500]}"
         )
+    body = jsonio.loads(resp_body)
+    return {"content": body.get("content", ""), "etag": resp_headers.get("ETag", "")}
 
 
 def upsert_wiki_page(
@@ -656,11 +894,10 @@ def upsert_wiki_page(
     Returns:
         Page metadata dict from ADO API
     """
-    proj = urllib.parse.quote(config.project, safe="")
     encoded_wiki = urllib.parse.quote(wiki_id, safe="")
     encoded_path = urllib.parse.quote(path, safe="/")
     url = (
-        f"https://dev.azure.com/{config.organization}/{proj}"
+        f"{config.project_url}"
         f"/_apis/wiki/wikis/{encoded_wiki}/pages?path={encoded_path}"
         f"&api-version={ADO_API_VERSION}"
     )
@@ -672,22 +909,15 @@ def upsert_wiki_page(
     if etag:
         headers["If-Match"] = etag
 
-    body = json.dumps({"content": content}).encode("utf-8")
-    req = urllib.request.Request(url, data=body, headers=headers, method="PUT")
+    body = jsonio.dumps({"content": content}, indent=False)
 
-    try:
-        time.sleep(RATE_LIMIT_DELAY)
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        body_text = ""
-        try:
-            body_text = e.read().decode("utf-8")
-        except Exception:
-            pass
+    status, reason, _, resp_body = _request(url, method="PUT", data=body, headers=headers)
+    if status >= 400:
+        body_text = resp_body.decode("utf-8", errors="replace")
         raise RuntimeError(
-            f"Wiki page PUT error {e.code}: {e.reason}\nResponse: {body_text[:500]}"
+            f"Wiki page PUT error {status}: {reason}\nResponse: {body_text[:500]}"
         )
+    return jsonio.loads(resp_body)
 
 
 def create_project_wiki(config: AdoConfig) -> dict:
@@ -699,19 +929,13 @@ def create_project_wiki(config: AdoConfig) -> dict:
     Returns:
         Wiki metadata dict from ADO API (id, name, type, etc.)
     """
-    proj = urllib.parse.quote(config.project, safe="")
     url = (
-        f"https://dev.azure.com/{config.organization}/{proj}"
+        f"{config.project_url}"
         f"/_apis/wiki/wikis?api-version={ADO_API_VERSION}"
     )
 
-    # Fetch the project ID needed for the wiki creation payload
-    project_url = (
-        f"https://dev.azure.com/{config.organization}/_apis/projects/"
-        f"{proj}?api-version={ADO_API_VERSION}"
-    )
-    project_info = _api_request(config, project_url, method="GET")
-    project_id = project_info.get("id", "")
+    # The project ID needed for the wiki creation payload
+    project_id = _project_id(config)
 
     body = {
         "type": "projectWiki",
@@ -731,7 +955,8 @@ def upload_wiki_attachment(
     Upload a file attachment to an ADO wiki.
 
     ADO wiki attachments require the file content to be base64-encoded
-    and sent as application/octet-stream.
+    and sent as application/octet-stream. The file is streamed, so memory
+    use does not grow with its size.
 
     Args:
         config: ADO connection config
@@ -750,34 +975,38 @@ def upload_wiki_attachment(
     if not filename:
         filename = fp.name
 
-    proj = urllib.parse.quote(config.project, safe="")
     encoded_wiki = urllib.parse.quote(wiki_id, safe="")
     encoded_name = urllib.parse.quote(filename, safe="")
     url = (
-        f"https://dev.azure.com/{config.organization}/{proj}"
+        f"{config.project_url}"
         f"/_apis/wiki/wikis/{encoded_wiki}/attachments?name={encoded_name}"
         f"&api-version={ADO_API_VERSION}"
     )
 
     default_path = f"/.attachments/{filename}"
 
-    file_data = base64.b64encode(fp.read_bytes())
+    # Streamed: the file is base64-encoded chunk by chunk as it is sent
+    file_data = _FileBody(fp, base64_encode=True)
     headers = {
         "Authorization": config.auth_header,
         "Content-Type": "application/octet-stream",
+        "Content-Length": str(file_data.length),
     }
-    req = urllib.request.Request(url, data=file_data, headers=headers, method="PUT")
 
-    try:
-        time.sleep(RATE_LIMIT_DELAY)
-        with urllib.request.urlopen(req) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-        return result.get("path", default_path)
-    except urllib.error.HTTPError as e:
-        # 500 with "already exists" or 409 Conflict — attachment was uploaded before
-        if e.code in (409, 500):
-            return default_path
-        raise
+    # No retry on 5xx: ADO answers 500 when the attachment already exists
+    status, reason, _, resp_body = _request(url, method="PUT", data=file_data, headers=headers,
+                                            retry_server_errors=False)
+    # 500 with "already exists" or 409 Conflict — attachment was uploaded before
+    if status in (409, 500):
+        return default_path
+    if status >= 400:
+        raise RuntimeError(
+            f"ADO API error {status}: {reason}\n"
+            f"URL: {url}\n"
+            f"Response: {resp_body.decode('utf-8', errors='replace')[:500]}"
+        )
+    result = jsonio.loads(resp_body) if resp_body else {}
+    return result.get("path", default_path)
 
 
 def list_repositories(config: AdoConfig) -> list[dict]:
@@ -787,9 +1016,8 @@ def list_repositories(config: AdoConfig) -> list[dict]:
     Returns:
         List of repo dicts with id, name, remoteUrl, etc.
     """
-    proj = urllib.parse.quote(config.project, safe="")
     url = (
-        f"https://dev.azure.com/{config.organization}/{proj}"
+        f"{config.project_url}"
         f"/_apis/git/repositories?api-version={ADO_API_VERSION}"
     )
     result = _api_request(config, url, method="GET")
@@ -804,52 +1032,347 @@ def _api_request(
     method: str = "GET",
     body: dict | list | None = None,
     content_type: str = "application/json",
+    data: "bytes | _FileBody | None" = None,
 ) -> dict:
-    """Make an authenticated API request to ADO."""
+    """Make an authenticated API request to ADO.
+
+    body is sent as JSON; pass raw bytes, or a _FileBody to stream a file
+    upload, as data instead.
+    """
     headers = {
         "Authorization": config.auth_header,
         "Content-Type": content_type,
     }
+    if isinstance(data, _FileBody):
+        headers["Content-Length"] = str(data.length)
 
-    data = None
     if body is not None:
-        data = json.dumps(body).encode("utf-8")
-
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
-
+        data = jsonio.dumps(body, indent=False)
+
+    # GETs are served from a short-lived cache; the body is re-parsed on
+    # every hit so callers can't mutate each other's results
+    cache_key = (url, config.auth_header) if method == "GET" else None
+    resp_body = _cache_get(cache_key) if cache_key else None
+    if resp_body is None:
+        generation = _get_cache_generation
+        status, reason, _, resp_body = _request(url, method=method, data=data, headers=headers)
+        if status >= 400:
+            body_text = resp_body.decode("utf-8", errors="replace")
+            raise RuntimeError(
+                f"ADO API error {status}: {reason}\n"
+                f"URL: {url}\n"
+                f"Response: {body_text[:500]}"
+            )
+        if cache_key:
+            _cache_put(cache_key, resp_body, generation)
+    return jsonio.loads(resp_body) if resp_body else {}
+
+
+def _cache_get(key: tuple) -> bytes | None:
+    """Return a fresh cached GET body, or None."""
+    with _get_cache_lock:
+        entry = _get_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > GET_CACHE_TTL:
+            del _get_cache[key]
+            return None
+        _get_cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_put(key: tuple, body: bytes, generation: int) -> None:
+    """Cache a GET body unless a write happened since the GET was sent."""
+    with _get_cache_lock:
+        if generation != _get_cache_generation:
+            return
+        _get_cache[key] = (time.monotonic(), body)
+        _get_cache.move_to_end(key)
+        if len(_get_cache) > GET_CACHE_SIZE:
+            _get_cache.popitem(last=False)
+
+
+def _request(
+    url: str,
+    method: str = "GET",
+    data: bytes | Iterable[bytes] | None = None,
+    headers: dict | None = None,
+    retry_server_errors: bool = True,
+) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+    """Send a request with the shared rate-limit delay, retries and call stats.
+
+    429 responses are retried after the server's Retry-After (exponential
+    backoff if it sends none), as are 5xx ones unless retry_server_errors
+    is False. The wait is applied to the shared bucket, so every thread
+    holds off, not just this one. Returns the final
+    (status, reason, headers, body) without raising on HTTP errors.
+    """
     global _call_count, _call_total_seconds
 
     retries = 3
     for attempt in range(retries):
-        try:
-            time.sleep(RATE_LIMIT_DELAY)
-            t0 = time.monotonic()
-            with urllib.request.urlopen(req) as resp:
-                resp_body = resp.read().decode("utf-8")
+        _bucket.acquire()
+        t0 = time.monotonic()
+        status, reason, resp_headers, resp_body = _send(url, method=method, data=data, headers=headers)
+        if method != "GET" and not (method == "POST" and _is_read_only_post(url)):
+            _clear_get_cache()
+        last_attempt = attempt == retries - 1
+        if status == 429:  # Rate limited
+            delay = _retry_after(resp_headers)
+            if delay is None:
+                delay = 2 ** (attempt + 1)
+            _bucket.pause(delay)
+            if not last_attempt:
+                logger.warning("Rate limited, waiting %.1fs...", delay)
+                continue
+        if status >= 500 and retry_server_errors and not last_attempt:
+            time.sleep(2 ** attempt)
+            continue
+        if status < 400:
+            with _stats_lock:
                 _call_total_seconds += time.monotonic() - t0
                 _call_count += 1
-                return json.loads(resp_body) if resp_body else {}
-        except urllib.error.HTTPError as e:
-            body_text = ""
+            # ADO only sends this when we are close to being throttled
+            remaining = resp_headers.get("X-RateLimit-Remaining")
+            if remaining is not None and _to_float(remaining, 1.0) < 1:
+                _bucket.pause(_retry_after(resp_headers) or 0.0)
+        return status, reason, resp_headers, resp_body
+
+
+def _is_read_only_post(url: str) -> bool:
+    """True for POST endpoints that query rather than change anything."""
+    path = urllib.parse.urlsplit(url).path
+    return path.endswith(_READ_ONLY_POSTS)
+
+
+def _retry_after(headers) -> float | None:
+    """Seconds the server asked us to wait, from Retry-After or X-RateLimit-Reset."""
+    value = headers.get("Retry-After")
+    if value:
+        seconds = _to_float(value)
+        if seconds is None:  # HTTP-date form
             try:
-                body_text = e.read().decode("utf-8")
-            except Exception:
-                pass
+                seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                seconds = None
+        if seconds is not None:
+            return max(0.0, seconds)
+    reset = _to_float(headers.get("X-RateLimit-Reset"))  # epoch seconds
+    if reset is not None:
+        return max(0.0, reset - time.time())
+    return None
+
+
+def _to_float(value, default=None):
+    """Parse a numeric header value, returning default if it is absent or malformed."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class _FileBody:
+    """Request body that streams a file from disk, optionally base64-encoded.
+
+    Can be iterated more than once, so a retried request re-reads the file.
+    """
+
+    _CHUNK = 48 * 1024  # a multiple of 3, so base64 chunks need no padding
+
+    def __init__(self, path, base64_encode: bool = False):
+        self.path = path
+        self.base64_encode = base64_encode
+        size = os.path.getsize(path)
+        self.length = 4 * -(-size // 3) if base64_encode else size
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            while chunk := f.read(self._CHUNK):
+                yield base64.b64encode(chunk) if self.base64_encode else chunk
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: bursts up to capacity, then rate calls/second.
+
+    A caller that finds the bucket empty reserves the next token and sleeps
+    until it is due, so waiting threads are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping only if none is available."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for at least seconds, dropping any saved-up burst."""
+        with self._lock:
+            # Credit time already elapsed first, so it can't count against the pause
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update; call with the lock held."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+
+# Client-side throttle shared by every API call (see _request)
+_bucket = _TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
 
-            if e.code == 429:  # Rate limited
-                delay = 2 ** (attempt + 1)
-                logger.warning("Rate limited, waiting %ds...", delay)
-                time.sleep(delay)
-                continue
-            elif e.code >= 500 and attempt < retries - 1:
-                delay = 2 ** attempt
-                time.sleep(delay)
-                continue
-            else:
-                raise RuntimeError(
-                    f"ADO API error {e.code}: {e.reason}\n"
-                    f"URL: {url}\n"
-                    f"Response: {body_text[:500]}"
-                )
 
-    raise RuntimeError(f"ADO API request failed after {retries} retries: {url}")
+def _map_concurrent(fn, items: list) -> list:
+    """Apply fn to every item on up to MAX_WORKERS threads; results keep input order.
+
+    A single item runs inline. The first exception is re-raised.
+    """
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+def _cached_metadata(key: tuple, fetch):
+    """Return fetch()'s result, reused for METADATA_TTL seconds per key."""
+    now = time.monotonic()
+    with _metadata_lock:
+        hit = _metadata_cache.get(key)
+    if hit is not None and now - hit[0] < METADATA_TTL:
+        return hit[1]
+    value = fetch()
+    with _metadata_lock:
+        _metadata_cache[key] = (now, value)
+    return value
+
+
+def _project_id(config: AdoConfig) -> str:
+    """Return the project's GUID, looked up once per METADATA_TTL."""
+    def fetch() -> str:
+        url = (
+            f"{config.org_url}/_apis/projects/{config.project_path}"
+            f"?api-version={ADO_API_VERSION}"
+        )
+        return _api_request(config, url, method="GET").get("id", "")
+
+    return _cached_metadata(("project_id", config.organization, config.project,
+                             config.auth_header), fetch)
+
+
+def _single_flight(key: tuple, fn, *args, **kwargs):
+    """Run fn once for concurrent callers with the same key; all get its result.
+
+    Only coalesces calls that overlap in time — nothing is cached afterwards.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        return future.result()
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+def _get_connection(host: str) -> http.client.HTTPSConnection:
+    """Return this thread's keep-alive connection to host, opening it if needed.
+
+    A pooled connection the server has closed while idle is replaced first,
+    so a write is never sent into a dead socket.
+    """
+    conns = _local.__dict__.setdefault("conns", {})
+    conn = conns.get(host)
+    if conn is not None and conn.sock is not None and _is_stale(conn.sock):
+        conn.close()
+        conn = None
+    if conn is None:
+        global _ssl_context
+        with _conns_lock:
+            if _ssl_context is None:
+                _ssl_context = ssl.create_default_context()
+        conn = http.client.HTTPSConnection(host, timeout=HTTP_TIMEOUT, context=_ssl_context)
+        conns[host] = conn
+        with _conns_lock:
+            _all_conns.add(conn)
+    return conn
+
+
+def _is_stale(sock) -> bool:
+    """True if an idle socket is readable: the server closed it (EOF) or sent junk."""
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _send(
+    url: str,
+    method: str = "GET",
+    data: bytes | Iterable[bytes] | None = None,
+    headers: dict | None = None,
+) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+    """Send one request over a pooled keep-alive connection.
+
+    Returns (status, reason, headers, body) without raising on HTTP errors.
+    Responses are requested compressed and the body is returned decoded.
+
+    A dropped connection is reopened and the request resent once, but only
+    when that cannot repeat a write: for reads (GET, HEAD, read-only POSTs),
+    or when a reused idle socket failed before the request was written.
+    An iterable body must therefore be re-iterable; pass its Content-Length too.
+    """
+    parts = urllib.parse.urlsplit(url)
+    target = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    headers = {"Accept-Encoding": "gzip, deflate", **(headers or {})}
+    idempotent = method in ("GET", "HEAD") or (method == "POST" and _is_read_only_post(url))
+    for attempt in range(2):
+        conn = _get_connection(parts.netloc)
+        reused = conn.sock is not None
+        sent = False
+        try:
+            conn.request(method, target, body=data, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            body = _decode_body(resp.read(), resp.headers.get("Content-Encoding"))
+            return resp.status, resp.reason, resp.headers, body
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            _local.conns.pop(parts.netloc, None)
+            if attempt or not (idempotent or (reused and not sent)):
+                raise
+
+
+def _decode_body(body: bytes, encoding: str | None) -> bytes:
+    """Undo a gzip or deflate Content-Encoding; other bodies pass through."""
+    encoding = (encoding or "").strip().lower()
+    if not body or encoding in ("", "identity"):
+        return body
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:  # some servers send raw deflate without the zlib header
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from core.config import get_output_path
+from core.jsonio import write_json
 
 
 def append_event(proj: dict, event_type: str, **data) -> None:
@@ -36,5 +37,4 @@ def append_event(proj: dict, event_type: str, **data) -> None:
     })
 
     events_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(events_path, "w", encoding="utf-8") as f:
-        json.dump(events, f, indent=2)
+    write_json(events_path, events)
@@ -0,0 +1,44 @@
+"""JSON file I/O helpers for pipeline artifacts.
+
+Uses orjson when it is installed (several times faster, emits bytes
+directly) and falls back to the stdlib json module otherwise. Both paths
+write UTF-8 JSON with a 2-space indent.
+"""
+
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, not a hard dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj, indent: bool = True) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def loads(data: bytes | str):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(path: Path, obj) -> None:
+    """Write obj to path as indented JSON in a single write."""
+    path.write_bytes(dumps(obj))
+
+
+def read_json(path: Path):
+    """Read and parse a JSON file in a single read."""
+    return loads(path.read_bytes())
@@ -15,6 +15,8 @@ import email
 import base64
 import hashlib
 import mimetypes
+import os
+import stat
 from pathlib import Path
 from dataclasses import dataclass, field
 
@@ -42,6 +44,8 @@ class ParsedFile:
     image_media_type: str = ""   # MIME type of image
     metadata: dict = field(default_factory=dict)  # Extra info (sheet names, email headers, etc.)
     error: str = ""      # Error message if parsing failed
+    source_path: str = ""        # Path the file was read from (set by parse_directory)
+    source_stat: os.stat_result | None = None  # stat of source_path, taken once at discovery
 
 
 def parse_file(filepath: Path) -> ParsedFile:
@@ -83,7 +87,11 @@ def parse_directory(directory: Path) -> list[ParsedFile]:
         return results
 
     for f in sorted(directory.rglob("*")):
-        if not f.is_file():
+        try:
+            st = f.stat()
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
             continue
         if f.name.startswith("."):
             continue
@@ -92,9 +100,14 @@ def parse_directory(directory: Path) -> list[ParsedFile]:
                 filename=f.name,
                 format="unknown",
                 error=f"Skipped unsupported format: {f.suffix}",
+                source_path=str(f),
+                source_stat=st,
             ))
             continue
-        results.append(parse_file(f))
+        pf = parse_file(f)
+        pf.source_path = str(f)
+        pf.source_stat = st
+        results.append(pf)
 
     return results
 
@@ -374,7 +387,12 @@ def _parse_image(filepath: Path) -> ParsedFile:
 
 def estimate_tokens(text: str) -> int:
     """Rough token estimate: ~4 characters per token."""
-    return len(text) // 4
+    return estimate_tokens_from_len(len(text))
+
+
+def estimate_tokens_from_len(n_chars: int) -> int:
+    """Token estimate from a character count, without needing the text."""
+    return n_chars // 4
 
 
 def compute_file_hash(text: str) -> str:
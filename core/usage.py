@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from core.config import get_output_path
+from core.jsonio import write_json
 
 # Pricing: Claude API rates (USD per 1M tokens)
 PRICING = {
@@ -72,8 +73,7 @@ def log_operation(
 
     # Write back
     usage_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(usage_path, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2)
+    write_json(usage_path, entries)
 
     return entry
 
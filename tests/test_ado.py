@@ -0,0 +1,144 @@
+"""Tests for the core.ado transport helpers."""
+
+import http.client
+import http.server
+import threading
+import time
+import unittest
+from unittest import mock
+
+from core import ado
+
+URL = "https://dev.azure.com/org/proj/_apis/wit/workitems/$Task?api-version=7.1"
+
+
+class FakeResponse:
+    status = 200
+    reason = "OK"
+
+    def __init__(self):
+        self.headers = http.client.HTTPMessage()
+
+    def read(self):
+        return b"{}"
+
+
+class FakeConnection:
+    """Records requests; fails the first one at the given step."""
+
+    def __init__(self, log, reused=True, fail_at=None):
+        self.sock = object() if reused else None
+        self.log = log
+        self.fail_at = fail_at
+
+    def request(self, method, target, body=None, headers=None):
+        if self.fail_at == "request":
+            raise BrokenPipeError()
+        self.log.append(method)
+
+    def getresponse(self):
+        if self.fail_at == "response":
+            raise http.client.RemoteDisconnected("closed")
+        return FakeResponse()
+
+    def close(self):
+        pass
+
+
+class SendRetryTest(unittest.TestCase):
+    def send(self, method, url, fail_at):
+        log = []
+        conns = iter([FakeConnection(log, fail_at=fail_at), FakeConnection(log)])
+        with mock.patch.object(ado, "_get_connection", lambda host: next(conns)):
+            ado._local.conns = {}
+            try:
+                ado._send(url, method=method, data=b"[]")
+            except (http.client.HTTPException, ConnectionError):
+                return log, False
+        return log, True
+
+    def test_write_dropped_after_sending_is_not_resent(self):
+        log, ok = self.send("POST", URL, fail_at="response")
+        self.assertFalse(ok)
+        self.assertEqual(log, ["POST"])
+
+    def test_write_on_stale_socket_is_resent(self):
+        log, ok = self.send("PATCH", URL, fail_at="request")
+        self.assertTrue(ok)
+        self.assertEqual(log, ["PATCH"])
+
+    def test_reads_are_resent(self):
+        for method, url in (("GET", URL),
+                            ("POST", "https://dev.azure.com/org/proj/_apis/wit/wiql")):
+            log, ok = self.send(method, url, fail_at="response")
+            self.assertTrue(ok)
+            self.assertEqual(log, [method, method])
+
+
+class IdleCloseHandler(http.server.BaseHTTPRequestHandler):
+    """Keep-alive handler that closes the connection after 0.2s idle."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = 0.2
+    log = []
+
+    def do_GET(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        if n:
+            self.rfile.read(n)
+        self.log.append(self.command)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+class StaleConnectionTest(unittest.TestCase):
+    def setUp(self):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), IdleCloseHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        port = server.server_address[1]
+
+        class LocalConnection(http.client.HTTPConnection):
+            def __init__(self, host, timeout=None, context=None):
+                super().__init__("127.0.0.1", port, timeout=timeout)
+
+        patcher = mock.patch.object(http.client, "HTTPSConnection", LocalConnection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(ado.close_connections)
+        IdleCloseHandler.log = []
+        ado._local.conns = {}
+
+    def test_post_after_server_closed_idle_socket_is_sent_once(self):
+        ado._send(URL.replace("$Task", "1"), method="GET")
+        time.sleep(0.5)  # server half-closes the idle keep-alive socket
+        status, _, _, _ = ado._send(URL, method="POST")
+        self.assertEqual(status, 200)
+        self.assertEqual(IdleCloseHandler.log, ["GET", "POST"])
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_pause_after_elapsed_time_waits_full_delay(self):
+        now = [100.0]
+        sleeps = []
+        with mock.patch.object(ado.time, "monotonic", lambda: now[0]), \
+                mock.patch.object(ado.time, "sleep", sleeps.append):
+            bucket = ado._TokenBucket(rate=10.0, capacity=10)
+            bucket.acquire()
+            now[0] += 1.5  # a slow request, then a 429 with Retry-After: 2
+            bucket.pause(2.0)
+            bucket.acquire()
+        self.assertEqual(len(sleeps), 1)
+        self.assertGreaterEqual(sleeps[0], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
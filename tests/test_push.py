@@ -0,0 +1,105 @@
+"""Tests for commands.push resume and dedup behaviour."""
+
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from unittest import mock
+
+from commands import push
+from core.jsonio import write_json
+
+PUSH_DATA = {
+    "epics": [{
+        "id": "E1",
+        "name": "Epic A",
+        "features": [
+            {"id": "F1", "name": "Feat 1", "stories": []},
+            {"id": "F2", "name": "Feat 2", "stories": []},
+        ],
+    }],
+}
+
+
+class FakeAdo:
+    """Stands in for core.ado; only knows what _run needs for epics and features."""
+
+    def __init__(self):
+        self.items = {}  # ado id -> (type, title)
+        self.created = Counter()
+        self.fail_titles = set()
+
+    def create_work_item(self, config, work_item_type, title, **kwargs):
+        if title in self.fail_titles:
+            raise RuntimeError(f"ADO API error 500: {title}")
+        ado_id = len(self.items) + 1
+        self.items[ado_id] = (work_item_type, title)
+        self.created[title] += 1
+        return {"id": ado_id}
+
+    def get_work_items_by_query(self, config, wiql, fields=None):
+        return [
+            {"id": ado_id, "fields": {"System.WorkItemType": wit, "System.Title": title}}
+            for ado_id, (wit, title) in self.items.items()
+            if f"'{title}'" in wiql
+        ]
+
+
+class RerunAfterFailureTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        (Path(tmp.name) / "output").mkdir()
+        self.proj = {"project": "Demo", "path": tmp.name, "state": {}}
+        write_json(push.get_output_path(self.proj, "push_ready.json"), PUSH_DATA)
+
+        self.ado = FakeAdo()
+        patches = [
+            mock.patch.multiple(
+                push.ado_client,
+                from_project=mock.Mock(return_value=mock.Mock(project="Demo")),
+                test_connection=mock.Mock(return_value=True),
+                ensure_repository=mock.Mock(return_value={}),
+                create_work_item=self.ado.create_work_item,
+                get_work_items_by_query=self.ado.get_work_items_by_query,
+                get_call_stats=mock.Mock(return_value={"count": 0, "total_seconds": 0}),
+                close_connections=mock.Mock(),
+            ),
+            mock.patch.object(push.click, "confirm", return_value=True),
+            mock.patch.object(push, "_attach_reference_sources"),
+            mock.patch.object(push, "invalidate_downstream"),
+            mock.patch.object(push, "update_state"),
+            mock.patch.object(push, "append_event"),
+            mock.patch.object(push, "log_operation"),
+            mock.patch.dict("sys.modules", {"commands.rtm": mock.Mock()}),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_rerun_reuses_items_created_before_failure(self):
+        self.ado.fail_titles = {"Feat 2"}
+        with self.assertRaises(RuntimeError):
+            push.run(self.proj)
+
+        # Rerun well within _EXISTING_CACHE_TTL
+        self.ado.fail_titles = set()
+        push.run(self.proj)
+
+        self.assertEqual(self.ado.created, Counter({"Epic A": 1, "Feat 1": 1, "Feat 2": 1}))
+        mapping = push.read_json(push.get_output_path(self.proj, "ado_mapping.json"))
+        self.assertEqual(sorted(mapping["features"]), ["F1", "F2"])
+
+
+class QuotedTitleChunksTest(unittest.TestCase):
+    def test_chunks_stay_within_length_and_keep_every_title(self):
+        titles = [f"{'x' * 250} {i}" for i in range(500)] + ["it's"]
+        chunks = list(push._quoted_title_chunks(titles, 10000))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(c) <= 10000 for c in chunks))
+        self.assertEqual(", ".join(chunks).split(", "),
+                         ["'" + t.replace("'", "''") + "'" for t in titles])
+
+
+if __name__ == "__main__":
+    unittest.main()